@@ -7,12 +7,23 @@ from aws_lambda_powertools import (
 from boto3 import (
     client,
 )
+from botocore.exceptions import (
+    ClientError,
+)
+from datetime import (
+    datetime,
+    timezone,
+)
 from json import (
     dumps,
+    loads,
 )
 from os import (
     getenv,
 )
+from typing import (
+    Optional,
+)
 
 TABLE_NAME = getenv("TABLE_NAME")
 dynamodb = client("dynamodb")
@@ -22,24 +33,105 @@ logger = Logger(
 )
 
 
-def handler(event: dict, context: LambdaContext) -> None:
-    logger.debug(event)
+def write_failure(
+    id: str,
+    parameters: str,
+    callback_url: Optional[str] = None,
+) -> bool:
+    expression_attribute_values = {
+        ":failure": {
+            "S": "Failure",
+        },
+        ":now": {
+            "S": datetime.now(timezone.utc).isoformat(),
+        },
+        ":parameters": {
+            "S": parameters,
+        },
+        ":success": {
+            "S": "Success",
+        },
+    }
+    update_expression = ("SET #parameters = :parameters, "
+                         "#status = :failure, "
+                         "completed_at = :now, "
+                         "updated_at = :now")
 
-    for record in event["Records"]:
-        body = record["body"]
-        id = record["messageAttributes"]["id"]["stringValue"]
+    if callback_url is not None:
+        expression_attribute_values[":callback_url"] = {
+            "S": callback_url,
+        }
+        update_expression += ", callback_url = :callback_url"
 
-        dynamodb.put_item(
-            Item={
+    try:
+        dynamodb.update_item(
+            ConditionExpression=("attribute_not_exists(id) OR "
+                                 "#status <> :success"),
+            ExpressionAttributeNames={
+                "#parameters": "parameters",
+                "#status": "status",
+            },
+            ExpressionAttributeValues=expression_attribute_values,
+            Key={
                 "id": {
                     "S": id,
                 },
-                "parameters": {
-                    "S": dumps(body),
-                },
-                "status": {
-                    "S": "Failure",
-                },
             },
             TableName=TABLE_NAME,
+            UpdateExpression=update_expression,
         )
+    except ClientError as client_error:
+        error_code = client_error.response["Error"]["Code"]
+
+        if error_code != "ConditionalCheckFailedException":
+            raise
+
+        return False
+
+    return True
+
+
+def handler(event: dict, context: LambdaContext) -> dict:
+    logger.debug(event)
+
+    batch_item_failures = list()
+
+    for record in event["Records"]:
+        message_id = record["messageId"]
+
+        try:
+            body = record["body"]
+            id = record["messageAttributes"]["id"]["stringValue"]
+        except KeyError as key_error:
+            logger.error((f"Record {message_id} parsing failed "
+                          f"with missing key: {key_error}"))
+            batch_item_failures.append(message_id)
+
+            continue
+
+        callback_url = None
+
+        try:
+            parameters = loads(body)
+        except (TypeError, ValueError):
+            parameters = None
+
+        if isinstance(parameters, dict) and "callback_url" in parameters:
+            callback_url = str(parameters["callback_url"])
+
+        try:
+            if not write_failure(id, dumps(body), callback_url):
+                logger.info(f"Job {id} already succeeded, skipping it")
+        except Exception as exception:
+            logger.error((f"Record {message_id} writing failed "
+                          f"with exception: {exception}"))
+            batch_item_failures.append(message_id)
+
+    return {
+        "batchItemFailures": [
+            {
+                "itemIdentifier": message_id,
+            }
+            for message_id in batch_item_failures
+        ],
+    }
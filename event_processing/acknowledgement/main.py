@@ -0,0 +1,106 @@
+from asyncio import (
+    Task,
+    create_task,
+    gather,
+    sleep,
+    to_thread,
+)
+from aws_lambda_powertools import (
+    Logger,
+)
+from botocore.client import (
+    BaseClient,
+)
+from collections import (
+    defaultdict,
+)
+from typing import (
+    Optional,
+)
+
+MAX_BATCH_SIZE = 10
+
+
+class AckCoalescer:
+    def __init__(
+        self,
+        logger: Logger,
+        sqs_client: BaseClient,
+        max_delay: float = 1,
+    ) -> None:
+        self.__flushes: set[Task] = set()
+        self.__flushing: Optional[Task] = None
+        self.__logger = logger
+        self.__max_delay = max_delay
+        self.__pending: dict = defaultdict(list)
+        self.__sqs_client = sqs_client
+
+    async def __delete(self, queue_url: str, receipt_handles: list) -> None:
+        try:
+            response = await to_thread(
+                self.__sqs_client.delete_message_batch,
+                Entries=[
+                    {
+                        "Id": str(index),
+                        "ReceiptHandle": receipt_handle,
+                    }
+                    for index, receipt_handle in enumerate(receipt_handles)
+                ],
+                QueueUrl=queue_url,
+            )
+            failed_receipt_handles = [
+                receipt_handles[int(failed["Id"])]
+                for failed in response.get("Failed", [])
+            ]
+        except Exception as exception:
+            self.__logger.warning(("Messages batch deletion failed "
+                                   f"with exception: {exception}"))
+
+            failed_receipt_handles = receipt_handles
+
+        for receipt_handle in failed_receipt_handles:
+            try:
+                await to_thread(
+                    self.__sqs_client.delete_message,
+                    QueueUrl=queue_url,
+                    ReceiptHandle=receipt_handle,
+                )
+            except Exception as exception:
+                self.__logger.error(("Message deletion failed "
+                                     f"with exception: {exception}"))
+
+    async def __flush_periodically(self) -> None:
+        while True:
+            await sleep(self.__max_delay)
+
+            self.flush()
+
+    def __schedule(self, queue_url: str) -> None:
+        receipt_handles = self.__pending.pop(queue_url)
+        flush = create_task(self.__delete(queue_url, receipt_handles))
+
+        self.__flushes.add(flush)
+        flush.add_done_callback(self.__flushes.discard)
+
+    def acknowledge(self, queue_url: str, receipt_handle: str) -> None:
+        pending = self.__pending[queue_url]
+
+        pending.append(receipt_handle)
+
+        if len(pending) >= MAX_BATCH_SIZE:
+            self.__schedule(queue_url)
+
+    def flush(self) -> None:
+        for queue_url in list(self.__pending):
+            self.__schedule(queue_url)
+
+    def start(self) -> None:
+        self.__flushing = create_task(self.__flush_periodically())
+
+    async def stop(self) -> None:
+        if self.__flushing is not None:
+            self.__flushing.cancel()
+
+        self.flush()
+
+        await gather(*self.__flushes)
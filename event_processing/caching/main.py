@@ -0,0 +1,146 @@
+from asyncio import (
+    to_thread,
+)
+from aws_lambda_powertools import (
+    Logger,
+)
+from botocore.client import (
+    BaseClient,
+)
+from collections import (
+    OrderedDict,
+)
+from event_processing.metrics.main import (
+    MetricsPublisher,
+)
+from hashlib import (
+    sha256,
+)
+from json import (
+    dumps,
+)
+from time import (
+    time,
+)
+from typing import (
+    Optional,
+)
+
+
+class ResultCache:
+    def __init__(
+        self,
+        dynamodb: BaseClient,
+        logger: Logger,
+        metrics: MetricsPublisher,
+        max_size: int = 1024,
+        table_name: Optional[str] = None,
+        ttl: int = 86400,
+    ) -> None:
+        self.__dynamodb = dynamodb
+        self.__entries: OrderedDict = OrderedDict()
+        self.__logger = logger
+        self.__max_size = max_size
+        self.__metrics = metrics
+        self.__table_name = table_name
+        self.__ttl = ttl
+
+    async def __get_shared(self, key: str) -> Optional[tuple]:
+        try:
+            response = await to_thread(
+                self.__dynamodb.get_item,
+                Key={
+                    "key": {
+                        "S": key,
+                    },
+                },
+                TableName=self.__table_name,
+            )
+        except Exception as exception:
+            self.__logger.warning(("Result cache reading failed "
+                                   f"with exception: {exception}"))
+
+            return None
+
+        if "Item" not in response:
+            return None
+
+        item = response["Item"]
+
+        return int(item["expires_at"]["N"]), item["attributes"]["M"]
+
+    def __put_local(
+        self,
+        key: str,
+        expires_at: int,
+        attributes: dict,
+    ) -> None:
+        self.__entries[key] = (expires_at, attributes)
+        self.__entries.move_to_end(key)
+
+        while len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[dict]:
+        entry = self.__entries.get(key)
+
+        if entry is not None and entry[0] > time():
+            self.__entries.move_to_end(key)
+            self.__metrics.add_metric(name="ResultCacheLocalHits", value=1)
+
+            return entry[1]
+
+        if self.__table_name is not None:
+            entry = await self.__get_shared(key)
+
+            if entry is not None and entry[0] > time():
+                self.__put_local(key, *entry)
+                self.__metrics.add_metric(
+                    name="ResultCacheSharedHits",
+                    value=1,
+                )
+
+                return entry[1]
+
+        self.__metrics.add_metric(name="ResultCacheMisses", value=1)
+
+        return None
+
+    def key(self, type: str, version: str, parameters: dict) -> str:
+        canonical_parameters = dumps(
+            parameters,
+            separators=(",", ":"),
+            sort_keys=True,
+        )
+
+        return sha256(
+            f"{type}#{version}#{canonical_parameters}".encode(),
+        ).hexdigest()
+
+    async def put(self, key: str, attributes: dict) -> None:
+        expires_at = int(time()) + self.__ttl
+
+        self.__put_local(key, expires_at, attributes)
+
+        if self.__table_name is None:
+            return
+
+        try:
+            await to_thread(
+                self.__dynamodb.put_item,
+                Item={
+                    "attributes": {
+                        "M": attributes,
+                    },
+                    "expires_at": {
+                        "N": str(expires_at),
+                    },
+                    "key": {
+                        "S": key,
+                    },
+                },
+                TableName=self.__table_name,
+            )
+        except Exception as exception:
+            self.__logger.warning(("Result cache writing failed "
+                                   f"with exception: {exception}"))
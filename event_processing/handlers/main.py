@@ -0,0 +1,82 @@
+from enum import (
+    Enum,
+)
+from pydantic import (
+    BaseModel,
+)
+from typing import (
+    Callable,
+    Iterator,
+    Optional,
+)
+
+
+class JobExecutor(Enum):
+    INLINE = "inline"
+    PROCESS = "process"
+    THREAD = "thread"
+
+
+class JobHandler:
+    def __init__(
+        self,
+        handler: Callable[[dict], dict],
+        type: str,
+        cacheable: bool = False,
+        executor: JobExecutor = JobExecutor.THREAD,
+        max_in_flight_jobs: Optional[int] = None,
+        model: Optional[type[BaseModel]] = None,
+        reports_progress: bool = False,
+        timeout: Optional[float] = None,
+        version: str = "1",
+    ) -> None:
+        if reports_progress and executor is JobExecutor.PROCESS:
+            raise ValueError((f"Job type {type} can't report progress "
+                              "from a process executor"))
+
+        self.cacheable = cacheable
+        self.executor = executor
+        self.handler = handler
+        self.max_in_flight_jobs = max_in_flight_jobs
+        self.model = model
+        self.reports_progress = reports_progress
+        self.timeout = timeout
+        self.type = type
+        self.version = version
+
+
+class HandlerRegistry:
+    def __init__(
+        self,
+        handlers: list,
+        default_type: Optional[str] = None,
+    ) -> None:
+        self.__default_type = default_type
+        self.__handlers: dict[str, JobHandler] = dict()
+
+        for handler in handlers:
+            self.register(handler)
+
+    def __iter__(self) -> Iterator[JobHandler]:
+        return iter(self.__handlers.values())
+
+    def register(self, handler: JobHandler) -> None:
+        if handler.type in self.__handlers:
+            raise ValueError(f"Job type {handler.type} already registered")
+
+        self.__handlers[handler.type] = handler
+
+    def resolve(self, message: dict) -> JobHandler:
+        type = message.get("MessageAttributes", dict()).get("type", dict()).\
+            get("StringValue")
+
+        if type is None and isinstance(message["Body"], dict):
+            type = message["Body"].get("type")
+
+        if type is None:
+            type = self.__default_type
+
+        if type not in self.__handlers:
+            raise ValueError(f"Job type {type} not registered")
+
+        return self.__handlers[type]
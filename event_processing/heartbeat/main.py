@@ -0,0 +1,160 @@
+from asyncio import (
+    Task,
+    create_task,
+    sleep,
+    to_thread,
+)
+from aws_lambda_powertools import (
+    Logger,
+)
+from botocore.client import (
+    BaseClient,
+)
+from collections import (
+    defaultdict,
+)
+from event_processing.metrics.main import (
+    MetricsPublisher,
+)
+from time import (
+    monotonic,
+)
+from typing import (
+    Optional,
+)
+
+MAX_BATCH_SIZE = 10
+
+
+class VisibilityHeartbeat:
+    def __init__(
+        self,
+        logger: Logger,
+        metrics: MetricsPublisher,
+        sqs_client: BaseClient,
+        interval: float = 15,
+        visibility_margin: int = 30,
+        visibility_timeout: int = 300,
+    ) -> None:
+        self.__beating: Optional[Task] = None
+        self.__in_flight: dict = defaultdict(dict)
+        self.__interval = interval
+        self.__logger = logger
+        self.__metrics = metrics
+        self.__sqs_client = sqs_client
+        self.__visibility_margin = visibility_margin
+        self.__visibility_timeout = visibility_timeout
+
+    async def __beat(self) -> None:
+        while True:
+            await sleep(self.__interval)
+
+            now = monotonic()
+
+            for queue_url, receipt_handles in list(self.__in_flight.items()):
+                expiring = [
+                    receipt_handle
+                    for receipt_handle, expires_at in receipt_handles.items()
+                    if expires_at - now <= self.__visibility_margin
+                ]
+
+                if not expiring:
+                    continue
+
+                extended = await self.change_visibility(
+                    queue_url,
+                    expiring,
+                    self.__visibility_timeout,
+                )
+
+                if extended == len(expiring):
+                    for receipt_handle in expiring:
+                        if receipt_handle in receipt_handles:
+                            receipt_handles[receipt_handle] = \
+                                now + self.__visibility_timeout
+
+                self.__metrics.add_metric(
+                    name="VisibilityExtensions",
+                    value=extended,
+                )
+
+    async def __release(self, receipt_handles: dict) -> None:
+        for queue_url, batch in list(receipt_handles.items()):
+            released = await self.change_visibility(queue_url, list(batch), 0)
+
+            self.__metrics.add_metric(name="ReleasedMessages", value=released)
+
+    async def change_visibility(
+        self,
+        queue_url: str,
+        receipt_handles: list,
+        visibility_timeout: int,
+    ) -> int:
+        changed = 0
+
+        for start in range(0, len(receipt_handles), MAX_BATCH_SIZE):
+            batch = receipt_handles[start:start + MAX_BATCH_SIZE]
+
+            try:
+                response = await to_thread(
+                    self.__sqs_client.change_message_visibility_batch,
+                    Entries=[
+                        {
+                            "Id": str(index),
+                            "ReceiptHandle": receipt_handle,
+                            "VisibilityTimeout": visibility_timeout,
+                        }
+                        for index, receipt_handle in enumerate(batch)
+                    ],
+                    QueueUrl=queue_url,
+                )
+            except Exception as exception:
+                self.__logger.warning(("Messages visibility change failed "
+                                       f"with exception: {exception}"))
+
+                continue
+
+            for failed in response.get("Failed", []):
+                self.__logger.warning(("Message visibility change failed "
+                                       f"with code: {failed['Code']}"))
+
+            changed += len(response.get("Successful", []))
+
+        return changed
+
+    async def release(self, items: list) -> None:
+        receipt_handles = defaultdict(list)
+
+        for queue_url, message in items:
+            receipt_handles[queue_url].append(message["ReceiptHandle"])
+
+        await self.__release(receipt_handles)
+
+    async def release_in_flight(self) -> None:
+        await self.__release(self.__in_flight)
+
+    def start(self) -> None:
+        self.__beating = create_task(self.__beat())
+
+    def stop(self) -> None:
+        if self.__beating is not None:
+            self.__beating.cancel()
+
+    def track(
+        self,
+        queue_url: str,
+        receipt_handle: str,
+        expires_at: Optional[float] = None,
+    ) -> None:
+        if expires_at is None:
+            expires_at = monotonic() + self.__visibility_margin
+
+        self.__in_flight[queue_url][receipt_handle] = expires_at
+
+    def untrack(self, queue_url: str, receipt_handle: str) -> None:
+        receipt_handles = self.__in_flight[queue_url]
+
+        receipt_handles.pop(receipt_handle, None)
+
+        if not receipt_handles:
+            del self.__in_flight[queue_url]
@@ -1,5 +1,10 @@
+from asyncio import (
+    get_running_loop,
+    run,
+)
 from aws_lambda_powertools import (
     Logger,
+    Metrics,
 )
 from aws_lambda_powertools.utilities.parser import (
     BaseModel,
@@ -7,7 +12,36 @@ from aws_lambda_powertools.utilities.parser import (
 )
 from boto3 import (
     client,
-    resource,
+)
+from botocore.config import (
+    Config,
+)
+from event_processing.acknowledgement.main import (
+    AckCoalescer,
+)
+from event_processing.caching.main import (
+    ResultCache,
+)
+from event_processing.handlers.main import (
+    HandlerRegistry,
+    JobExecutor,
+    JobHandler,
+)
+from event_processing.heartbeat.main import (
+    VisibilityHeartbeat,
+)
+from event_processing.metrics.main import (
+    MetricsPublisher,
+)
+from event_processing.receiving.main import (
+    Receiver,
+    WeightedReceiver,
+)
+from event_processing.results.main import (
+    ResultWriter,
+)
+from event_processing.worker.main import (
+    Worker,
 )
 from json import (
     loads,
@@ -15,15 +49,31 @@ from json import (
 from os import (
     getenv,
 )
+from signal import (
+    SIGINT,
+    SIGTERM,
+)
 from time import (
     sleep,
 )
+from typing import (
+    Callable,
+    Optional,
+)
 
 
 class Id(BaseModel):
     StringValue: str
 
 
+class Job:
+    __slots__ = ("id", "seconds")
+
+    def __init__(self, id: str, seconds: int) -> None:
+        self.id = id
+        self.seconds = seconds
+
+
 class MsgAttrs(BaseModel):
     id: Id
 
@@ -41,70 +91,196 @@ class Event(BaseModel):
     ReceiptHandle: str
 
 
+DEDUPLICATE = getenv("DEDUPLICATE", "true") == "true"
+DRAIN_TIMEOUT = int(getenv("DRAIN_TIMEOUT", "90"))
+MAX_IN_FLIGHT_JOBS = int(getenv("MAX_IN_FLIGHT_JOBS", "10"))
+PREFETCH_SIZE = int(getenv("PREFETCH_SIZE", "10"))
+PRIORITY_QUEUES = loads(getenv("PRIORITY_QUEUES", "[]"))
+PROGRESS_INTERVAL = int(getenv("PROGRESS_INTERVAL", "10"))
 QUEUE_NAME = getenv("QUEUE_NAME")
+QUEUE_URL = getenv("QUEUE_URL")
+QUEUE_WEIGHT = int(getenv("QUEUE_WEIGHT", "1"))
+RECEIVE_WAIT_TIME = int(getenv("RECEIVE_WAIT_TIME", "20"))
+RESULT_CACHE_SIZE = int(getenv("RESULT_CACHE_SIZE", "0"))
+RESULT_CACHE_TABLE_NAME = getenv("RESULT_CACHE_TABLE_NAME")
+RESULT_CACHE_TTL = int(getenv("RESULT_CACHE_TTL", "86400"))
+STRICT_VALIDATION = getenv("STRICT_VALIDATION", "false") == "true"
 TABLE_NAME = getenv("TABLE_NAME")
 TIMEOUT = int(getenv("TIMEOUT"))
-dynamodb = client("dynamodb")
+TIMEOUT_MARGIN = 5
+TYPE = "sleep"
+VISIBILITY_MARGIN = int(getenv("VISIBILITY_MARGIN", "30"))
+VISIBILITY_TIMEOUT = int(getenv("VISIBILITY_TIMEOUT", str(TIMEOUT)))
+WORKER_PROCESSES = int(getenv("WORKER_PROCESSES", "0"))
+config = Config(
+    max_pool_connections=MAX_IN_FLIGHT_JOBS + 1 + len(PRIORITY_QUEUES),
+)
+dynamodb = client("dynamodb", config=config)
 logger = Logger(
     level=getenv("LOG_LEVEL", "INFO"),
     service="event_processing",
 )
-sqs_client = client("sqs")
-sqs_resource = resource("sqs")
+metrics = MetricsPublisher(
+    metrics=Metrics(
+        namespace="EventProcessing",
+        service="event_processing",
+    ),
+)
+sqs_client = client("sqs", config=config)
+
+
+def decode(event: dict, strict: bool = False) -> Job:
+    if strict:
+        event = parse(event=event, model=Event)
 
+        return Job(
+            id=event.MessageAttributes.id.StringValue,
+            seconds=event.Body.seconds,
+        )
 
-def event_processing(event: Event) -> None:
+    try:
+        id = event["MessageAttributes"]["id"]["StringValue"]
+        seconds = event["Body"]["seconds"]
+    except (KeyError, TypeError) as error:
+        raise ValueError(f"Event missing field {error}") from error
+
+    if type(id) is not str or type(seconds) is not int:
+        raise ValueError(f"Event with invalid id {id} or seconds {seconds}")
+
+    return Job(id=id, seconds=seconds)
+
+
+def event_processing(
+    event: dict,
+    report_progress: Optional[Callable[[float], None]] = None,
+) -> dict:
     logger.debug(event)
 
-    event = parse(event=event, model=Event)
-    id = event.MessageAttributes.id.StringValue
-    parameters = event.Body
-    seconds = parameters.seconds
+    job = decode(event, strict=STRICT_VALIDATION)
+    id = job.id
+    seconds = job.seconds
     message = f"I slept for {seconds} seconds"
 
     if seconds > TIMEOUT:
         raise ValueError(f"{seconds} major then {TIMEOUT}")
 
-    sleep(seconds)
+    if report_progress is None:
+        sleep(seconds)
+    else:
+        for second in range(seconds):
+            sleep(1)
+            report_progress((second + 1) / seconds)
 
     results = f"{{\"message\": \"{message}\"}}"
 
-    dynamodb.put_item(
-        Item={
-            "id": {
-                "S": id,
-            },
-            "results": {
-                "S": results,
-            },
-            "status": {
-                "S": "Success",
-            },
+    return {
+        "id": {
+            "S": id,
         },
-        TableName=TABLE_NAME,
-    )
+        "results": {
+            "S": results,
+        },
+        "status": {
+            "S": "Success",
+        },
+    }
+
+
+async def serve(worker: Worker) -> None:
+    loop = get_running_loop()
+
+    for signal in [SIGINT, SIGTERM]:
+        loop.add_signal_handler(signal, worker.stop)
+
+    await worker.start()
 
 
 if __name__ == "__main__":
-    while True:
-        try:
-            jobs_queue = sqs_resource.get_queue_by_name(QueueName=QUEUE_NAME)
-            jobs_queue_url = jobs_queue.url
-            response = sqs_client.receive_message(
-                MaxNumberOfMessages=10,
-                MessageAttributeNames=["All"],
-                QueueUrl=jobs_queue_url,
-            )
-
-            for message in response.get("Messages", []):
-                id = message["MessageAttributes"]["id"]["StringValue"]
-                message["Body"] = loads(message["Body"])
-
-                event_processing(message)
-                sqs_client.delete_message(
-                    QueueUrl=jobs_queue_url,
-                    ReceiptHandle=message["ReceiptHandle"],
-                )
-        except Exception as exception:
-            logger.error((f"Message {id} processing failed "
-                          f"with exception: {exception}"))
+    ack_coalescer = AckCoalescer(
+        logger=logger,
+        sqs_client=sqs_client,
+    )
+    handlers = HandlerRegistry(
+        default_type=TYPE,
+        handlers=[
+            JobHandler(
+                cacheable=True,
+                executor=(JobExecutor.PROCESS if WORKER_PROCESSES > 0
+                          else JobExecutor.THREAD),
+                handler=event_processing,
+                model=Parameters if STRICT_VALIDATION else None,
+                reports_progress=WORKER_PROCESSES == 0,
+                timeout=TIMEOUT + TIMEOUT_MARGIN,
+                type=TYPE,
+            ),
+        ],
+    )
+    heartbeat = VisibilityHeartbeat(
+        interval=VISIBILITY_MARGIN / 2,
+        logger=logger,
+        metrics=metrics,
+        sqs_client=sqs_client,
+        visibility_margin=VISIBILITY_MARGIN,
+        visibility_timeout=VISIBILITY_TIMEOUT,
+    )
+    queues = [
+        {
+            "name": QUEUE_NAME,
+            "url": QUEUE_URL,
+            "weight": QUEUE_WEIGHT,
+        },
+        *PRIORITY_QUEUES,
+    ]
+    total_weight = sum(queue["weight"] for queue in queues)
+    receivers = [
+        (
+            Receiver(
+                logger=logger,
+                metrics=metrics,
+                prefetch_size=max(
+                    PREFETCH_SIZE * queue["weight"] // total_weight,
+                    1,
+                ),
+                queue_name=queue["name"],
+                queue_url=queue["url"],
+                sqs_client=sqs_client,
+                visibility_margin=VISIBILITY_MARGIN,
+                visibility_timeout=VISIBILITY_TIMEOUT,
+                wait_time_seconds=RECEIVE_WAIT_TIME,
+            ),
+            queue["weight"],
+        )
+        for queue in queues
+    ]
+    receiver = WeightedReceiver(receivers=receivers) \
+        if len(receivers) > 1 else receivers[0][0]
+    result_cache = ResultCache(
+        dynamodb=dynamodb,
+        logger=logger,
+        max_size=RESULT_CACHE_SIZE,
+        metrics=metrics,
+        table_name=RESULT_CACHE_TABLE_NAME,
+        ttl=RESULT_CACHE_TTL,
+    ) if RESULT_CACHE_SIZE > 0 or RESULT_CACHE_TABLE_NAME else None
+    result_writer = ResultWriter(
+        dynamodb=dynamodb,
+        logger=logger,
+        progress_interval=PROGRESS_INTERVAL,
+        table_name=TABLE_NAME,
+    )
+    worker = Worker(
+        ack_coalescer=ack_coalescer,
+        deduplicate=DEDUPLICATE,
+        drain_timeout=DRAIN_TIMEOUT,
+        handlers=handlers,
+        heartbeat=heartbeat,
+        logger=logger,
+        max_in_flight_jobs=MAX_IN_FLIGHT_JOBS,
+        metrics=metrics,
+        processes=WORKER_PROCESSES,
+        receiver=receiver,
+        result_cache=result_cache,
+        result_writer=result_writer,
+    )
+
+    run(serve(worker))
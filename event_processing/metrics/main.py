@@ -0,0 +1,64 @@
+from asyncio import (
+    Task,
+    create_task,
+    sleep,
+)
+from aws_lambda_powertools import (
+    Metrics,
+)
+from aws_lambda_powertools.metrics import (
+    MetricUnit,
+)
+from json import (
+    dumps,
+)
+from threading import (
+    Lock,
+)
+from typing import (
+    Optional,
+)
+
+
+class MetricsPublisher:
+    def __init__(
+        self,
+        metrics: Metrics,
+        flush_interval: int = 60,
+    ) -> None:
+        self.__flush_interval = flush_interval
+        self.__flushing: Optional[Task] = None
+        self.__lock = Lock()
+        self.__metrics = metrics
+
+    async def __flush_periodically(self) -> None:
+        while True:
+            await sleep(self.__flush_interval)
+
+            self.flush()
+
+    def add_metric(
+        self,
+        name: str,
+        value: float,
+        unit: MetricUnit = MetricUnit.Count,
+    ) -> None:
+        with self.__lock:
+            self.__metrics.add_metric(name=name, unit=unit, value=value)
+
+    def flush(self) -> None:
+        with self.__lock:
+            if not self.__metrics.metric_set:
+                return
+
+            print(dumps(self.__metrics.serialize_metric_set()))
+            self.__metrics.clear_metrics()
+
+    def start(self) -> None:
+        self.__flushing = create_task(self.__flush_periodically())
+
+    def stop(self) -> None:
+        if self.__flushing is not None:
+            self.__flushing.cancel()
+
+        self.flush()
@@ -0,0 +1,314 @@
+from asyncio import (
+    FIRST_COMPLETED,
+    Event,
+    Queue,
+    Task,
+    create_task,
+    sleep,
+    to_thread,
+    wait,
+)
+from aws_lambda_powertools import (
+    Logger,
+)
+from botocore.client import (
+    BaseClient,
+)
+from botocore.exceptions import (
+    ClientError,
+)
+from collections import (
+    OrderedDict,
+    deque,
+)
+from event_processing.metrics.main import (
+    MetricsPublisher,
+)
+from time import (
+    monotonic,
+)
+from typing import (
+    Optional,
+)
+
+MAX_NUMBER_OF_MESSAGES = 10
+NON_EXISTENT_QUEUE_ERROR_CODES = [
+    "AWS.SimpleQueueService.NonExistentQueue",
+    "QueueDoesNotExist",
+]
+
+
+class TenantQueue(Queue):
+    def _get(self) -> Optional[tuple]:
+        tenant, items = self._queue.popitem(last=False)
+        item = items.popleft()
+
+        if items:
+            self._queue[tenant] = items
+
+        self.__size -= 1
+
+        return item
+
+    def _init(self, maxsize: int) -> None:
+        self._queue: OrderedDict[Optional[str], deque] = OrderedDict()
+        self.__size = 0
+
+    def _put(self, item: Optional[tuple]) -> None:
+        tenant = None
+
+        if item is not None:
+            _, message, _ = item
+            tenant = message.get("MessageAttributes", dict()).get(
+                "tenant", dict()).get("StringValue", "")
+
+        self._queue.setdefault(tenant, deque()).append(item)
+        self.__size += 1
+
+    def qsize(self) -> int:
+        return self.__size
+
+
+class Receiver:
+    def __init__(
+        self,
+        logger: Logger,
+        metrics: MetricsPublisher,
+        queue_name: str,
+        sqs_client: BaseClient,
+        prefetch_size: int = 10,
+        queue_url: Optional[str] = None,
+        visibility_margin: int = 30,
+        visibility_timeout: int = 300,
+        wait_time_seconds: int = 20,
+    ) -> None:
+        self.__available: Optional[Event] = None
+        self.__buffer: Optional[TenantQueue] = None
+        self.__drained: Optional[Event] = None
+        self.__logger = logger
+        self.__metrics = metrics
+        self.__polling: Optional[Task] = None
+        self.__prefetch_size = prefetch_size
+        self.__queue_name = queue_name
+        self.__queue_url = queue_url
+        self.__sqs_client = sqs_client
+        self.__stopping = False
+        self.__visibility_margin = visibility_margin
+        self.__visibility_timeout = visibility_timeout
+        self.__wait_time_seconds = wait_time_seconds
+
+    async def __extend(self, queue_url: str, message: dict) -> bool:
+        try:
+            await to_thread(
+                self.__sqs_client.change_message_visibility,
+                QueueUrl=queue_url,
+                ReceiptHandle=message["ReceiptHandle"],
+                VisibilityTimeout=self.__visibility_timeout,
+            )
+        except Exception as exception:
+            self.__logger.warning((f"Message {message['MessageId']} "
+                                   "visibility extension failed "
+                                   f"with exception: {exception}"))
+            self.__metrics.add_metric(
+                name="PrefetchedMessagesDropped",
+                value=1,
+            )
+
+            return False
+
+        self.__metrics.add_metric(name="PrefetchedMessagesExtended", value=1)
+
+        return True
+
+    async def __poll(self) -> None:
+        while not self.__stopping:
+            free_slots = self.__prefetch_size - self.__buffer.qsize()
+
+            if free_slots <= 0:
+                self.__drained.clear()
+
+                await self.__drained.wait()
+
+                continue
+
+            received_at = monotonic()
+
+            try:
+                queue_url, messages = await self.__receive(
+                    min(free_slots, MAX_NUMBER_OF_MESSAGES))
+            except Exception as exception:
+                self.__logger.error(("Messages receiving failed "
+                                     f"with exception: {exception}"))
+
+                await sleep(1)
+
+                continue
+
+            for message in messages:
+                self.__buffer.put_nowait((queue_url, message, received_at))
+
+            if messages:
+                self.__available.set()
+
+    async def __receive(self, max_number_of_messages: int) -> tuple:
+        queue_url = await self.__resolve_queue_url()
+
+        try:
+            response = await to_thread(
+                self.__sqs_client.receive_message,
+                MaxNumberOfMessages=max_number_of_messages,
+                MessageAttributeNames=["All"],
+                QueueUrl=queue_url,
+                WaitTimeSeconds=self.__wait_time_seconds,
+            )
+        except ClientError as client_error:
+            error_code = client_error.response["Error"]["Code"]
+
+            if error_code in NON_EXISTENT_QUEUE_ERROR_CODES:
+                self.__queue_url = None
+
+                self.__metrics.add_metric(name="QueueUrlRefreshes", value=1)
+
+            raise
+
+        return queue_url, response.get("Messages", [])
+
+    async def __resolve_queue_url(self) -> str:
+        if self.__queue_url is None:
+            response = await to_thread(
+                self.__sqs_client.get_queue_url,
+                QueueName=self.__queue_name,
+            )
+            self.__queue_url = response["QueueUrl"]
+
+        return self.__queue_url
+
+    async def drain(self) -> list:
+        if self.__polling is not None:
+            await self.__polling
+
+        items = list()
+
+        while not self.__buffer.empty():
+            item = self.__buffer.get_nowait()
+
+            if item is not None:
+                queue_url, message, _ = item
+
+                items.append((queue_url, message))
+
+        return items
+
+    async def get(self) -> Optional[tuple]:
+        while True:
+            item = await self.__buffer.get()
+
+            self.__drained.set()
+
+            if item is None:
+                return None
+
+            queue_url, message, received_at = item
+            remaining_visibility = \
+                self.__visibility_timeout - (monotonic() - received_at)
+
+            if remaining_visibility >= self.__visibility_margin or \
+                    await self.__extend(queue_url, message):
+                return queue_url, message
+
+    def ready(self) -> bool:
+        return not self.__buffer.empty()
+
+    def start(self) -> None:
+        self.__available = Event()
+        self.__buffer = TenantQueue()
+        self.__drained = Event()
+        self.__polling = create_task(self.__poll())
+        self.__stopping = False
+
+    def stop(self) -> None:
+        if self.__polling is None:
+            return
+
+        self.__stopping = True
+
+        self.__available.set()
+        self.__drained.set()
+        self.__buffer.put_nowait(None)
+
+    async def wait(self) -> None:
+        while self.__buffer.empty():
+            self.__available.clear()
+
+            await self.__available.wait()
+
+
+class WeightedReceiver:
+    def __init__(self, receivers: list) -> None:
+        self.__credits = [0] * len(receivers)
+        self.__receivers: list[Receiver] = [
+            receiver for receiver, _ in receivers]
+        self.__stopping = False
+        self.__weights: list[int] = [weight for _, weight in receivers]
+
+    def __pick(self) -> Optional[Receiver]:
+        ready = [
+            index
+            for index, receiver in enumerate(self.__receivers)
+            if receiver.ready()
+        ]
+
+        if not ready:
+            return None
+
+        for index in ready:
+            self.__credits[index] += self.__weights[index]
+
+        picked = max(ready, key=lambda index: self.__credits[index])
+        self.__credits[picked] -= sum(
+            self.__weights[index] for index in ready)
+
+        return self.__receivers[picked]
+
+    async def drain(self) -> list:
+        items = list()
+
+        for receiver in self.__receivers:
+            items.extend(await receiver.drain())
+
+        return items
+
+    async def get(self) -> Optional[tuple]:
+        while not self.__stopping:
+            receiver = self.__pick()
+
+            if receiver is None:
+                waits = [
+                    create_task(receiver.wait())
+                    for receiver in self.__receivers
+                ]
+                _, pending = await wait(waits, return_when=FIRST_COMPLETED)
+
+                for waiting in pending:
+                    waiting.cancel()
+
+                continue
+
+            item = await receiver.get()
+
+            if item is not None:
+                return item
+
+        return None
+
+    def start(self) -> None:
+        self.__stopping = False
+
+        for receiver in self.__receivers:
+            receiver.start()
+
+    def stop(self) -> None:
+        self.__stopping = True
+
+        for receiver in self.__receivers:
+            receiver.stop()
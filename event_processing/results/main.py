@@ -0,0 +1,389 @@
+from asyncio import (
+    Future,
+    Task,
+    create_task,
+    gather,
+    get_running_loop,
+    sleep,
+    to_thread,
+)
+from aws_lambda_powertools import (
+    Logger,
+)
+from botocore.client import (
+    BaseClient,
+)
+from botocore.exceptions import (
+    ClientError,
+)
+from datetime import (
+    datetime,
+    timezone,
+)
+from random import (
+    uniform,
+)
+from time import (
+    sleep as wait,
+)
+from typing import (
+    Optional,
+)
+
+MAX_BATCH_SIZE = 25
+THROTTLING_ERROR_CODES = [
+    "ProvisionedThroughputExceededException",
+    "RequestLimitExceeded",
+    "ThrottlingException",
+]
+
+
+class ResultWriter:
+    def __init__(
+        self,
+        dynamodb: BaseClient,
+        logger: Logger,
+        table_name: str,
+        base_backoff: float = 0.05,
+        max_attempts: int = 8,
+        max_backoff: float = 5,
+        max_delay: float = 1,
+        progress_interval: float = 10,
+    ) -> None:
+        self.__base_backoff = base_backoff
+        self.__dynamodb = dynamodb
+        self.__flushes: set[Task] = set()
+        self.__flushing: Optional[Task] = None
+        self.__logger = logger
+        self.__max_attempts = max_attempts
+        self.__max_backoff = max_backoff
+        self.__max_delay = max_delay
+        self.__pending: list = list()
+        self.__progress: dict[str, tuple] = dict()
+        self.__progress_interval = progress_interval
+        self.__reporting: Optional[Task] = None
+        self.__table_name = table_name
+
+    def __batch_write(self, items: list) -> list:
+        request_items = {
+            self.__table_name: [
+                {
+                    "PutRequest": {
+                        "Item": item,
+                    },
+                }
+                for item in items
+            ],
+        }
+
+        for attempt in range(self.__max_attempts):
+            if attempt > 0:
+                wait(uniform(0, min(  # nosec
+                    self.__max_backoff,
+                    self.__base_backoff * 2 ** attempt,
+                )))
+
+            try:
+                response = self.__dynamodb.batch_write_item(
+                    RequestItems=request_items,
+                )
+            except ClientError as client_error:
+                error_code = client_error.response["Error"]["Code"]
+
+                if error_code not in THROTTLING_ERROR_CODES:
+                    raise
+
+                self.__logger.warning(("Items writing throttled "
+                                       f"at attempt {attempt}"))
+
+                continue
+
+            request_items = response.get("UnprocessedItems", dict())
+
+            if not request_items:
+                return list()
+
+            self.__logger.warning((f"{len(request_items[self.__table_name])} "
+                                   f"items unprocessed at attempt {attempt}"))
+
+        return [
+            request["PutRequest"]["Item"]
+            for request in request_items[self.__table_name]
+        ]
+
+    async def __flush(self, pending: list) -> None:
+        items = [item for item, _ in pending]
+
+        try:
+            unprocessed_items = await to_thread(self.write_items, items)
+        except Exception as exception:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(exception)
+
+            return
+
+        unprocessed_ids = {item["id"]["S"] for item in unprocessed_items}
+
+        for item, future in pending:
+            id = item["id"]["S"]
+
+            if future.done():
+                continue
+
+            if id in unprocessed_ids:
+                future.set_exception(
+                    RuntimeError(f"Item {id} writing failed"))
+            else:
+                future.set_result(None)
+
+    async def __flush_periodically(self) -> None:
+        while True:
+            await sleep(self.__max_delay)
+
+            self.flush()
+
+    async def __report(self, id: str, version: int, progress: float) -> None:
+        try:
+            await self.__update(
+                id,
+                version,
+                {
+                    "progress": {
+                        "N": str(progress),
+                    },
+                    "status": {
+                        "S": "Progress",
+                    },
+                },
+                ongoing=True,
+            )
+        except Exception as exception:
+            self.__logger.warning((f"Job {id} progress reporting failed "
+                                   f"with exception: {exception}"))
+
+    async def __report_periodically(self) -> None:
+        while True:
+            await sleep(self.__progress_interval)
+
+            progress = self.__progress
+            self.__progress = dict()
+
+            await gather(*[
+                self.__report(id, version, value)
+                for id, (version, value) in progress.items()
+            ])
+
+    async def __update(
+        self,
+        id: str,
+        version: int,
+        attributes: dict,
+        ongoing: bool = False,
+    ) -> bool:
+        condition_expression = "version = :version"
+        expression_attribute_names = dict()
+        expression_attribute_values = {
+            ":now": {
+                "S": datetime.now(timezone.utc).isoformat(),
+            },
+            ":version": {
+                "N": str(version),
+            },
+        }
+        update_expressions = list()
+
+        for index, (name, value) in enumerate(attributes.items()):
+            expression_attribute_names[f"#a{index}"] = name
+            expression_attribute_values[f":a{index}"] = value
+
+            update_expressions.append(f"#a{index} = :a{index}")
+
+        if ongoing:
+            condition_expression += " AND #status IN (:progress, :running)"
+            expression_attribute_names["#status"] = "status"
+            expression_attribute_values[":progress"] = {
+                "S": "Progress",
+            }
+            expression_attribute_values[":running"] = {
+                "S": "Running",
+            }
+
+        try:
+            await to_thread(
+                self.__dynamodb.update_item,
+                ConditionExpression=condition_expression,
+                ExpressionAttributeNames=expression_attribute_names,
+                ExpressionAttributeValues=expression_attribute_values,
+                Key={
+                    "id": {
+                        "S": id,
+                    },
+                },
+                TableName=self.__table_name,
+                UpdateExpression=("SET "
+                                  f"{', '.join(update_expressions)}, "
+                                  "updated_at = :now"),
+            )
+        except ClientError as client_error:
+            error_code = client_error.response["Error"]["Code"]
+
+            if error_code != "ConditionalCheckFailedException":
+                raise
+
+            return False
+
+        return True
+
+    async def claim(
+        self,
+        id: str,
+        message_id: str,
+        queued: bool = False,
+    ) -> Optional[int]:
+        try:
+            response = await to_thread(
+                self.__dynamodb.update_item,
+                ConditionExpression=("attribute_not_exists(id) OR "
+                                     "(#status <> :success AND "
+                                     "(attribute_not_exists(message_id) OR "
+                                     "message_id = :message_id OR "
+                                     "NOT (#status IN "
+                                     "(:progress, :queued, :running))))"),
+                ExpressionAttributeNames={
+                    "#status": "status",
+                },
+                ExpressionAttributeValues={
+                    ":message_id": {
+                        "S": message_id,
+                    },
+                    ":now": {
+                        "S": datetime.now(timezone.utc).isoformat(),
+                    },
+                    ":one": {
+                        "N": "1",
+                    },
+                    ":progress": {
+                        "S": "Progress",
+                    },
+                    ":queued": {
+                        "S": "Queued",
+                    },
+                    ":running": {
+                        "S": "Running",
+                    },
+                    ":status": {
+                        "S": "Queued" if queued else "Running",
+                    },
+                    ":success": {
+                        "S": "Success",
+                    },
+                },
+                Key={
+                    "id": {
+                        "S": id,
+                    },
+                },
+                ReturnValues="UPDATED_NEW",
+                TableName=self.__table_name,
+                UpdateExpression=("SET #status = :status, "
+                                  "message_id = :message_id, "
+                                  f"{'queued_at' if queued else 'started_at'}"
+                                  " = :now, "
+                                  "updated_at = :now "
+                                  "ADD version :one"),
+            )
+        except ClientError as client_error:
+            error_code = client_error.response["Error"]["Code"]
+
+            if error_code != "ConditionalCheckFailedException":
+                raise
+
+            return None
+
+        return int(response["Attributes"]["version"]["N"])
+
+    def flush(self) -> None:
+        if not self.__pending:
+            return
+
+        pending = self.__pending
+        self.__pending = list()
+        flush = create_task(self.__flush(pending))
+
+        self.__flushes.add(flush)
+        flush.add_done_callback(self.__flushes.discard)
+
+    async def mark_running(self, id: str, version: int) -> bool:
+        return await self.__update(
+            id,
+            version,
+            {
+                "started_at": {
+                    "S": datetime.now(timezone.utc).isoformat(),
+                },
+                "status": {
+                    "S": "Running",
+                },
+            },
+        )
+
+    def report_progress(self, id: str, version: int, progress: float) -> None:
+        self.__progress[id] = (version, progress)
+
+    def start(self) -> None:
+        self.__flushing = create_task(self.__flush_periodically())
+        self.__reporting = create_task(self.__report_periodically())
+
+    async def stop(self) -> None:
+        if self.__flushing is not None:
+            self.__flushing.cancel()
+
+        if self.__reporting is not None:
+            self.__reporting.cancel()
+
+        self.__progress.clear()
+
+        self.flush()
+
+        await gather(*self.__flushes)
+
+    async def write(self, item: dict, version: Optional[int] = None) -> bool:
+        if version is not None:
+            self.__progress.pop(item["id"]["S"], None)
+
+            return await self.__update(
+                item["id"]["S"],
+                version,
+                {
+                    "completed_at": {
+                        "S": datetime.now(timezone.utc).isoformat(),
+                    },
+                    **{
+                        name: value
+                        for name, value in item.items()
+                        if name != "id"
+                    },
+                },
+            )
+
+        future: Future = get_running_loop().create_future()
+
+        self.__pending.append((item, future))
+
+        if len(self.__pending) >= MAX_BATCH_SIZE:
+            self.flush()
+
+        await future
+
+        return True
+
+    def write_items(self, items: list) -> list:
+        items = list({item["id"]["S"]: item for item in items}.values())
+        unprocessed_items = list()
+
+        for index in range(0, len(items), MAX_BATCH_SIZE):
+            unprocessed_items.extend(
+                self.__batch_write(items[index:index + MAX_BATCH_SIZE]))
+
+        return unprocessed_items
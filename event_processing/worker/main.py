@@ -0,0 +1,382 @@
+from asyncio import (
+    Semaphore,
+    Task,
+    create_task,
+    get_running_loop,
+    wait,
+    wait_for,
+)
+from aws_lambda_powertools import (
+    Logger,
+)
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from concurrent.futures.process import (
+    BrokenProcessPool,
+)
+from event_processing.acknowledgement.main import (
+    AckCoalescer,
+)
+from event_processing.caching.main import (
+    ResultCache,
+)
+from event_processing.handlers.main import (
+    HandlerRegistry,
+    JobExecutor,
+    JobHandler,
+)
+from event_processing.heartbeat.main import (
+    VisibilityHeartbeat,
+)
+from event_processing.metrics.main import (
+    MetricsPublisher,
+)
+from event_processing.receiving.main import (
+    Receiver,
+)
+from event_processing.results.main import (
+    ResultWriter,
+)
+from json import (
+    loads,
+)
+from multiprocessing import (
+    get_context,
+)
+from os import (
+    cpu_count,
+)
+from time import (
+    monotonic,
+)
+from typing import (
+    Any,
+    Callable,
+    Optional,
+)
+
+NON_PARAMETER_FIELDS = [
+    "callback_url",
+    "priority",
+    "type",
+]
+
+
+class Worker:
+    def __init__(
+        self,
+        ack_coalescer: AckCoalescer,
+        handlers: HandlerRegistry,
+        heartbeat: VisibilityHeartbeat,
+        logger: Logger,
+        metrics: MetricsPublisher,
+        receiver: Receiver,
+        result_writer: ResultWriter,
+        deduplicate: bool = False,
+        drain_timeout: Optional[float] = None,
+        max_in_flight_jobs: int = 10,
+        processes: int = 0,
+        result_cache: Optional[ResultCache] = None,
+    ) -> None:
+        self.__ack_coalescer = ack_coalescer
+        self.__deduplicate = deduplicate
+        self.__drain_timeout = drain_timeout
+        self.__handler_slots: dict[str, Semaphore] = dict()
+        self.__handlers = handlers
+        self.__heartbeat = heartbeat
+        self.__in_flight_jobs: set[Task] = set()
+        self.__logger = logger
+        self.__loop = None
+        self.__max_in_flight_jobs = max_in_flight_jobs
+        self.__metrics = metrics
+        self.__processes = processes
+        self.__jobs_executors: dict[JobExecutor, Executor] = {
+            JobExecutor.THREAD: ThreadPoolExecutor(
+                max_workers=max_in_flight_jobs,
+                thread_name_prefix="event_processing",
+            ),
+        }
+        self.__receiver = receiver
+        self.__result_cache = result_cache
+        self.__result_writer = result_writer
+        self.__slots: Optional[Semaphore] = None
+        self.__stopped_at: Optional[float] = None
+        self.__stopping = False
+
+    def __capacity(self, handler: JobHandler) -> int:
+        capacity = handler.max_in_flight_jobs or self.__max_in_flight_jobs
+
+        if handler.executor is JobExecutor.PROCESS:
+            capacity = min(capacity, self.__processes or cpu_count())
+
+        return capacity
+
+    def __create_process_executor(self) -> Executor:
+        return ProcessPoolExecutor(
+            max_workers=self.__processes or None,
+            mp_context=get_context("spawn"),
+        )
+
+    async def __execute(
+        self,
+        handler: JobHandler,
+        message: dict,
+        report_progress: Callable[[float], None],
+    ) -> dict:
+        arguments = [message]
+
+        if handler.reports_progress:
+            arguments.append(report_progress)
+
+        if handler.executor is JobExecutor.INLINE:
+            return handler.handler(*arguments)
+
+        if handler.executor not in self.__jobs_executors:
+            self.__jobs_executors[handler.executor] = \
+                self.__create_process_executor()
+
+        jobs_executor = self.__jobs_executors[handler.executor]
+
+        try:
+            return await wait_for(
+                self.__loop.run_in_executor(
+                    jobs_executor,
+                    handler.handler,
+                    *arguments,
+                ),
+                timeout=handler.timeout,
+            )
+        except BrokenProcessPool:
+            if jobs_executor is self.__jobs_executors[handler.executor]:
+                self.__logger.warning("Job processes crashed, restarting them")
+                self.__metrics.add_metric(name="ProcessRestarts", value=1)
+                jobs_executor.shutdown(wait=False)
+
+                self.__jobs_executors[handler.executor] = \
+                    self.__create_process_executor()
+
+            raise
+
+    def __parameters(self, handler: JobHandler, body: Any) -> Any:
+        if handler.model is not None:
+            return handler.model.parse_obj(body).dict()
+
+        if not isinstance(body, dict):
+            return body
+
+        return {
+            name: value
+            for name, value in body.items()
+            if name not in NON_PARAMETER_FIELDS
+        }
+
+    async def __process(self, message: dict, queue_url: str) -> None:
+        id = message["MessageId"]
+        receipt_handle = message["ReceiptHandle"]
+
+        self.__heartbeat.track(queue_url, receipt_handle)
+
+        try:
+            id = message["MessageAttributes"]["id"]["StringValue"]
+            message["Body"] = loads(message["Body"])
+            handler = self.__handlers.resolve(message)
+
+            if handler.model is not None:
+                handler.model.parse_obj(message["Body"])
+
+            queued = self.__handler_slots[handler.type].locked()
+            version = None
+
+            if self.__deduplicate:
+                version = await self.__result_writer.claim(
+                    id,
+                    message["MessageId"],
+                    queued,
+                )
+
+                if version is None:
+                    self.__logger.info((f"Job {id} already succeeded or "
+                                        "claimed by another message, "
+                                        "skipping it"))
+                    self.__metrics.add_metric(name="DuplicateJobs", value=1)
+                    self.__ack_coalescer.acknowledge(
+                        queue_url, receipt_handle)
+
+                    return
+
+            item = await self.__run(handler, id, message, version, queued)
+
+            if item is None:
+                self.__logger.info((f"Job {id} superseded by a redelivery, "
+                                    "skipping it"))
+                self.__metrics.add_metric(name="SupersededJobs", value=1)
+                self.__ack_coalescer.acknowledge(queue_url, receipt_handle)
+
+                return
+
+            if isinstance(message["Body"], dict) and \
+                    "callback_url" in message["Body"]:
+                item["callback_url"] = {
+                    "S": str(message["Body"]["callback_url"]),
+                }
+
+            if not await self.__result_writer.write(item, version):
+                self.__logger.info((f"Job {id} superseded by a redelivery, "
+                                    "discarding its results"))
+                self.__metrics.add_metric(name="SupersededJobs", value=1)
+            else:
+                self.__metrics.add_metric(name="ProcessedJobs", value=1)
+
+            self.__ack_coalescer.acknowledge(queue_url, receipt_handle)
+        except Exception as exception:
+            self.__logger.error((f"Job {id} processing failed "
+                                 f"with exception: {exception}"))
+            self.__metrics.add_metric(name="FailedJobs", value=1)
+            self.__heartbeat.untrack(queue_url, receipt_handle)
+
+            await self.__heartbeat.release([(queue_url, message)])
+        finally:
+            self.__heartbeat.untrack(queue_url, receipt_handle)
+
+    async def __run(
+        self,
+        handler: JobHandler,
+        id: str,
+        message: dict,
+        version: Optional[int],
+        queued: bool,
+    ) -> Optional[dict]:
+        key = None
+
+        def report_progress(progress: float) -> None:
+            if version is not None:
+                self.__loop.call_soon_threadsafe(
+                    self.__result_writer.report_progress,
+                    id,
+                    version,
+                    progress,
+                )
+
+        if handler.cacheable and self.__result_cache is not None:
+            key = self.__result_cache.key(
+                handler.type,
+                handler.version,
+                self.__parameters(handler, message["Body"]),
+            )
+            attributes = await self.__result_cache.get(key)
+
+            if attributes is not None:
+                return {
+                    "id": {
+                        "S": id,
+                    },
+                    **attributes,
+                }
+
+        async with self.__handler_slots[handler.type]:
+            if version is not None and queued and \
+                    not await self.__result_writer.mark_running(id, version):
+                return None
+
+            item = await self.__execute(handler, message, report_progress)
+
+        if key is not None:
+            await self.__result_cache.put(key, {
+                name: value
+                for name, value in item.items()
+                if name != "id"
+            })
+
+        return item
+
+    def __stop(self) -> None:
+        self.__stopped_at = monotonic()
+        self.__stopping = True
+
+        self.__receiver.stop()
+        self.__slots.release()
+
+    async def start(self) -> None:
+        self.__loop = get_running_loop()
+        self.__handler_slots = {
+            handler.type: Semaphore(self.__capacity(handler))
+            for handler in self.__handlers
+        }
+        self.__slots = Semaphore(self.__max_in_flight_jobs)
+
+        self.__ack_coalescer.start()
+        self.__heartbeat.start()
+        self.__metrics.start()
+        self.__receiver.start()
+        self.__result_writer.start()
+
+        while True:
+            await self.__slots.acquire()
+
+            item = await self.__receiver.get()
+
+            if item is None or self.__stopping:
+                self.__slots.release()
+
+                break
+
+            queue_url, message = item
+            job = create_task(self.__process(message, queue_url))
+
+            self.__in_flight_jobs.add(job)
+            job.add_done_callback(self.__in_flight_jobs.discard)
+            job.add_done_callback(lambda _: self.__slots.release())
+
+        if self.__stopped_at is None:
+            self.__stopped_at = monotonic()
+
+        unstarted = await self.__receiver.drain()
+
+        if item is not None:
+            unstarted.append(item)
+
+        await self.__heartbeat.release(unstarted)
+
+        unfinished = set()
+
+        if self.__in_flight_jobs:
+            _, unfinished = await wait(
+                self.__in_flight_jobs,
+                timeout=None if self.__drain_timeout is None else max(
+                    0,
+                    self.__drain_timeout - (monotonic() - self.__stopped_at),
+                ),
+            )
+
+        if unfinished:
+            self.__logger.warning((f"{len(unfinished)} jobs not finished "
+                                   "before the drain timeout"))
+            self.__metrics.add_metric(
+                name="AbandonedJobs",
+                value=len(unfinished),
+            )
+
+            await self.__heartbeat.release_in_flight()
+
+            for job in unfinished:
+                job.cancel()
+
+            await wait(unfinished)
+
+        self.__heartbeat.stop()
+        for jobs_executor in self.__jobs_executors.values():
+            jobs_executor.shutdown(
+                cancel_futures=True,
+                wait=not unfinished,
+            )
+
+        await self.__result_writer.stop()
+        await self.__ack_coalescer.stop()
+
+        self.__metrics.stop()
+
+    def stop(self) -> None:
+        self.__loop.call_soon_threadsafe(self.__stop)
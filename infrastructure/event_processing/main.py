@@ -2,12 +2,29 @@ from aws_cdk import (
     ArnFormat,
     BundlingOptions,
     Duration,
+    IgnoreMode,
     RemovalPolicy,
     Stack,
 )
+from aws_cdk.aws_applicationautoscaling import (
+    AdjustmentType,
+    ScalableTarget,
+    StepScalingAction,
+)
+from aws_cdk.aws_cloudwatch import (
+    Alarm,
+    ComparisonOperator,
+    MathExpression,
+    Metric,
+    TreatMissingData,
+)
+from aws_cdk.aws_cloudwatch_actions import (
+    ApplicationScalingAction,
+)
 from aws_cdk.aws_dynamodb import (
     Attribute,
     AttributeType,
+    StreamViewType,
     Table,
     TableEncryption,
 )
@@ -45,14 +62,19 @@ from aws_cdk.aws_logs import (
 )
 from aws_cdk.aws_lambda import (
     Code,
+    EventSourceMapping,
+    FilterCriteria,
+    FilterRule,
     Function,
     LayerVersion,
     Runtime,
+    StartingPosition,
 )
 from aws_cdk.aws_lambda_destinations import (
     EventBridgeDestination,
 )
 from aws_cdk.aws_lambda_event_sources import (
+    DynamoEventSource,
     SqsEventSource,
 )
 from aws_cdk.aws_sqs import (
@@ -66,6 +88,11 @@ from constructs import (
 from pathlib import (
     Path,
 )
+from typing import (
+    Optional,
+)
+
+SHUTDOWN_MARGIN = 10
 
 
 class EventProcessingConstruct(Construct):
@@ -73,17 +100,47 @@ class EventProcessingConstruct(Construct):
         self,
         scope: Construct,
         construct_id: str,
+        backlog_latency_target: int = 60,
+        cpu: int = 256,
+        default_priority: str = "normal",
+        drain_timeout: int = 90,
+        error_handling_batch_size: int = 100,
+        error_handling_max_batching_window: int = 30,
+        error_handling_max_concurrency: int = 2,
         error_handling_timeout: int = 300,
         event_processing_timeout: int = 300,
+        fifo: bool = False,
+        job_duration: int = 10,
+        job_status_max_wait: int = 20,
         max_event_age: int = 21600,
+        max_in_flight_jobs: int = 10,
+        max_receive_count: int = 2,
         max_service_capacity: int = 5,
+        memory_limit_mib: int = 1024,
         min_service_capacity: int = 1,
+        multi_process: bool = False,
+        notification_batch_size: int = 100,
+        notification_retry_attempts: int = 2,
+        notification_timeout: int = 60,
         pending_window: int = 7,
+        prefetch_size: int = 10,
+        priorities: Optional[dict] = None,
         read_capacity: int = 5,
+        receive_wait_time: int = 20,
         removal_policy: RemovalPolicy = RemovalPolicy.DESTROY,
+        result_cache: bool = False,
+        result_cache_size: int = 1024,
+        result_cache_ttl: int = 86400,
         reserved_concurrent_executions: int = 100,
         retention: RetentionDays = RetentionDays.ONE_MONTH,
         retry_attempts: int = 0,
+        scale_in_cooldown: int = 300,
+        scale_out_cooldown: int = 60,
+        scale_to_zero: bool = False,
+        short_job_threshold: int = 0,
+        short_jobs_batch_size: int = 10,
+        stop_timeout: int = 120,
+        worker_processes: Optional[int] = None,
         write_capacity: int = 5,
     ) -> None:
         super().__init__(
@@ -91,6 +148,15 @@ class EventProcessingConstruct(Construct):
             construct_id,
         )
 
+        if drain_timeout + receive_wait_time + SHUTDOWN_MARGIN > stop_timeout:
+            raise ValueError((f"Drain timeout {drain_timeout} plus receive "
+                              f"wait time {receive_wait_time} leaves less "
+                              f"than {SHUTDOWN_MARGIN} seconds before "
+                              f"stop timeout {stop_timeout}"))
+
+        if worker_processes is None:
+            worker_processes = max(cpu // 1024, 1)
+
         self.__event_processing_cluster = Cluster(
             self,
             "EventProcessingCluster",
@@ -124,6 +190,41 @@ class EventProcessingConstruct(Construct):
             log_group_name=self.__event_processing_service_log_group_name,
             retention=retention,
         )
+        self.__event_processing_layer = LayerVersion(
+            self,
+            "EventProcessingLayer",
+            code=Code.from_asset(
+                str(
+                    Path(__file__).
+                    parent.
+                    parent.
+                    parent.
+                    joinpath("event_processing").
+                    resolve()
+                ),
+                bundling=BundlingOptions(
+                    command=[
+                        "bash",
+                        "-c",
+                        ("mkdir -p /asset-output/python/event_processing && "
+                         "cp -r /asset-input/. "
+                         "/asset-output/python/event_processing"),
+                    ],
+                    image=Runtime.PYTHON_3_9.bundling_image,
+                ),
+                exclude=[
+                    "**/__pycache__",
+                    "Dockerfile",
+                    "requirements.txt",
+                ],
+                ignore_mode=IgnoreMode.GLOB,
+            ),
+            compatible_runtimes=[
+                Runtime.PYTHON_3_9,
+            ],
+            description="Event Processing core and results writer",
+            license="MIT-0",
+        )
         self.__failed_jobs_event_bus = EventBus(
             self,
             "FailedJobsEventBus",
@@ -141,6 +242,7 @@ class EventProcessingConstruct(Construct):
             "FailedJobsDeadLetterQueue",
             encryption=QueueEncryption.KMS,
             encryption_master_key=self.__jobs_queue_key,
+            fifo=fifo,
             visibility_timeout=Duration.seconds(error_handling_timeout),
         )
         self.__jobs_table_key = Key(
@@ -193,8 +295,84 @@ class EventProcessingConstruct(Construct):
             point_in_time_recovery=True,
             read_capacity=read_capacity,
             removal_policy=removal_policy,
+            stream=StreamViewType.NEW_AND_OLD_IMAGES,
             write_capacity=write_capacity,
         )
+        self.completed_jobs_event_bus = EventBus(
+            self,
+            "CompletedJobsEventBus",
+        )
+        self.__notification_function = Function(
+            self,
+            "NotificationFunction",
+            code=Code.from_asset(
+                str(
+                    Path(__file__).
+                    parent.
+                    parent.
+                    parent.
+                    joinpath("notification").
+                    resolve()
+                ),
+                bundling=BundlingOptions(
+                    command=[
+                        "bash",
+                        "-c",
+                        ("cp /asset-input/main.py "
+                         "--target /asset-output "
+                         "--update"),
+                    ],
+                    image=Runtime.PYTHON_3_9.bundling_image,
+                ),
+            ),
+            environment={
+                "EVENT_BUS_NAME": self.
+                completed_jobs_event_bus.
+                event_bus_name,
+            },
+            handler="main.handler",
+            layers=[
+                self.__powertools_layer,
+            ],
+            reserved_concurrent_executions=reserved_concurrent_executions,
+            runtime=Runtime.PYTHON_3_9,
+            timeout=Duration.seconds(notification_timeout),
+        )
+        self.job_status_function = Function(
+            self,
+            "JobStatusFunction",
+            code=Code.from_asset(
+                str(
+                    Path(__file__).
+                    parent.
+                    parent.
+                    parent.
+                    joinpath("job_status").
+                    resolve()
+                ),
+                bundling=BundlingOptions(
+                    command=[
+                        "bash",
+                        "-c",
+                        ("cp /asset-input/main.py "
+                         "--target /asset-output "
+                         "--update"),
+                    ],
+                    image=Runtime.PYTHON_3_9.bundling_image,
+                ),
+            ),
+            environment={
+                "MAX_WAIT": str(job_status_max_wait),
+                "TABLE_NAME": self.jobs_table.table_name,
+            },
+            handler="main.handler",
+            layers=[
+                self.__powertools_layer,
+            ],
+            reserved_concurrent_executions=reserved_concurrent_executions,
+            runtime=Runtime.PYTHON_3_9,
+            timeout=Duration.seconds(job_status_max_wait + 5),
+        )
         self.__error_handling_function = Function(
             self,
             "ErrorHandlingFunction",
@@ -226,6 +404,7 @@ class EventProcessingConstruct(Construct):
             },
             handler="main.handler",
             layers=[
+                self.__event_processing_layer,
                 self.__powertools_layer,
             ],
             max_event_age=Duration.seconds(max_event_age),
@@ -235,19 +414,60 @@ class EventProcessingConstruct(Construct):
             runtime=Runtime.PYTHON_3_9,
             timeout=Duration.seconds(error_handling_timeout),
         )
+        self.short_jobs_queue: Optional[Queue] = None
         self.jobs_queue = Queue(
             self,
             "JobsQueue",
             encryption=QueueEncryption.KMS,
             encryption_master_key=self.__jobs_queue_key,
-            queue_name="jobs_queue",
+            fifo=fifo,
+            queue_name="jobs_queue.fifo" if fifo else "jobs_queue",
             dead_letter_queue=DeadLetterQueue(
-                max_receive_count=1,
+                max_receive_count=max_receive_count,
                 queue=self.__failed_jobs_dead_letter_queue,
             ),
+            receive_message_wait_time=Duration.seconds(receive_wait_time),
             retention_period=Duration.seconds(max_event_age),
             visibility_timeout=Duration.seconds(event_processing_timeout),
         )
+        self.priority_queues: dict[str, Queue] = dict()
+
+        if priorities is not None and default_priority not in priorities:
+            raise ValueError(
+                f"Default priority {default_priority} has no weight")
+
+        for priority in priorities or dict():
+            if priority == default_priority:
+                continue
+
+            self.priority_queues[priority] = Queue(
+                self,
+                f"JobsQueue{priority.capitalize()}",
+                encryption=QueueEncryption.KMS,
+                encryption_master_key=self.__jobs_queue_key,
+                fifo=fifo,
+                queue_name=(f"jobs_queue_{priority}.fifo" if fifo
+                            else f"jobs_queue_{priority}"),
+                dead_letter_queue=DeadLetterQueue(
+                    max_receive_count=max_receive_count,
+                    queue=self.__failed_jobs_dead_letter_queue,
+                ),
+                receive_message_wait_time=Duration.seconds(
+                    receive_wait_time),
+                retention_period=Duration.seconds(max_event_age),
+                visibility_timeout=Duration.seconds(
+                    event_processing_timeout),
+            )
+        self.__lanes = [
+            (
+                self.jobs_queue,
+                priorities[default_priority] if priorities else 1,
+            ),
+            *[
+                (queue, priorities[priority])
+                for priority, queue in self.priority_queues.items()
+            ],
+        ]
         self.__event_processing_service = QueueProcessingFargateService(
             self,
             "EventProcessingService",
@@ -262,11 +482,20 @@ class EventProcessingConstruct(Construct):
                 ),
             ],
             cluster=self.__event_processing_cluster,
+            cpu=cpu,
             enable_logging=True,
             environment={
+                "DRAIN_TIMEOUT": str(drain_timeout),
+                "MAX_IN_FLIGHT_JOBS": str(max_in_flight_jobs),
+                "PREFETCH_SIZE": str(prefetch_size),
                 "QUEUE_NAME": self.jobs_queue.queue_name,
+                "QUEUE_URL": self.jobs_queue.queue_url,
+                "RECEIVE_WAIT_TIME": str(receive_wait_time),
                 "TABLE_NAME": self.jobs_table.table_name,
                 "TIMEOUT": str(event_processing_timeout),
+                "VISIBILITY_TIMEOUT": str(event_processing_timeout),
+                "WORKER_PROCESSES": str(
+                    worker_processes if multi_process else 0),
             },
             log_driver=AwsLogDriver.aws_logs(
                 log_group=self.__event_processing_service_log_group,
@@ -274,8 +503,8 @@ class EventProcessingConstruct(Construct):
             ),
             image=self.__event_processing_image,
             max_scaling_capacity=max_service_capacity,
-            memory_limit_mib=1024,
-            min_scaling_capacity=min_service_capacity,
+            memory_limit_mib=memory_limit_mib,
+            min_scaling_capacity=0 if scale_to_zero else min_service_capacity,
             queue=self.jobs_queue,
         )
         self.__fargate_vpc = self.__event_processing_service.cluster.vpc
@@ -288,7 +517,9 @@ class EventProcessingConstruct(Construct):
         self.__dynamo_db_gateway_endpoint.add_to_policy(
             PolicyStatement(
                 actions=[
+                    "dynamodb:BatchWriteItem",
                     "dynamodb:PutItem",
+                    "dynamodb:UpdateItem",
                 ],
                 conditions={
                     "ArnEquals": {
@@ -309,7 +540,23 @@ class EventProcessingConstruct(Construct):
             )
         )
         self.__error_handling_function.add_event_source(
-            SqsEventSource(self.__failed_jobs_dead_letter_queue))
+            SqsEventSource(
+                self.__failed_jobs_dead_letter_queue,
+                batch_size=min(error_handling_batch_size, 10)
+                if fifo else error_handling_batch_size,
+                max_batching_window=None
+                if fifo else Duration.seconds(
+                    error_handling_max_batching_window),
+                report_batch_item_failures=True,
+            ),
+        )
+
+        for child in self.__error_handling_function.node.children:
+            if isinstance(child, EventSourceMapping):
+                child.node.default_child.add_property_override(
+                    "ScalingConfig.MaximumConcurrency",
+                    error_handling_max_concurrency,
+                )
         self.__error_handling_function.node.default_child.add_metadata(
             "checkov",
             {
@@ -332,6 +579,241 @@ class EventProcessingConstruct(Construct):
                 ],
             },
         )
+        self.__notification_function.add_event_source(
+            DynamoEventSource(
+                self.jobs_table,
+                batch_size=notification_batch_size,
+                bisect_batch_on_error=True,
+                filters=[
+                    FilterCriteria.filter({
+                        "dynamodb": {
+                            "NewImage": {
+                                "status": {
+                                    "S": FilterRule.or_(
+                                        "Failure",
+                                        "Success",
+                                    ),
+                                },
+                            },
+                        },
+                    }),
+                ],
+                report_batch_item_failures=True,
+                retry_attempts=notification_retry_attempts,
+                starting_position=StartingPosition.LATEST,
+            ),
+        )
+        self.__notification_function.node.default_child.add_metadata(
+            "checkov",
+            {
+                "skip": [
+                    {
+                        "comment": ("This function reports "
+                                    "batch item failures"),
+                        "id": "CKV_AWS_116",
+                    },
+                    {
+                        "comment": ("This function is not meant "
+                                    "to be run inside a VPC"),
+                        "id": "CKV_AWS_117",
+                    },
+                    {
+                        "comment": ("A customer managed key "
+                                    "is not required"),
+                        "id": "CKV_AWS_173",
+                    },
+                ],
+            },
+        )
+        self.completed_jobs_event_bus.grant_put_events_to(
+            self.__notification_function,
+        )
+        self.__event_processing_service.task_definition.node.default_child.\
+            add_property_override(
+                "ContainerDefinitions.0.StopTimeout",
+                stop_timeout,
+            )
+        self.__event_processing_scalable_target: ScalableTarget = self.\
+            __event_processing_service.\
+            service.\
+            node.\
+            find_child("TaskCount").\
+            node.\
+            find_child("Target")
+        self.__event_processing_scalable_target.node.try_remove_child(
+            "QueueMessagesVisibleScaling",
+        )
+        self.__backlog_scaling_policy = \
+            self.__event_processing_scalable_target.scale_to_track_metric(
+                "BacklogScaling",
+                custom_metric=self.
+                jobs_queue.
+                metric_approximate_number_of_messages_visible(),
+                scale_in_cooldown=Duration.seconds(scale_in_cooldown),
+                scale_out_cooldown=Duration.seconds(scale_out_cooldown),
+                target_value=backlog_latency_target,
+            )
+        self.__backlog_scaling_policy_configuration = \
+            "TargetTrackingScalingPolicyConfiguration."\
+            "CustomizedMetricSpecification"
+        backlog_metrics = list()
+        backlog_terms = list()
+
+        for index, (queue, weight) in enumerate(self.__lanes):
+            for id, metric_name in [
+                ("in_flight", "ApproximateNumberOfMessagesNotVisible"),
+                ("visible", "ApproximateNumberOfMessagesVisible"),
+            ]:
+                backlog_metrics.append({
+                    "Id": f"{id}_{index}",
+                    "MetricStat": {
+                        "Metric": {
+                            "Dimensions": [
+                                {
+                                    "Name": "QueueName",
+                                    "Value": queue.queue_name,
+                                },
+                            ],
+                            "MetricName": metric_name,
+                            "Namespace": "AWS/SQS",
+                        },
+                        "Stat": "Average",
+                    },
+                    "ReturnData": False,
+                })
+
+            backlog_terms.append(
+                f"{weight / self.__lanes[0][1]} * "
+                f"(visible_{index} + in_flight_{index})" if scale_to_zero
+                else f"{weight / self.__lanes[0][1]} * visible_{index}")
+
+        for name in ["Dimensions", "MetricName", "Namespace", "Statistic"]:
+            self.__backlog_scaling_policy.node.default_child.\
+                add_property_deletion_override(
+                    f"{self.__backlog_scaling_policy_configuration}.{name}",
+                )
+        self.__backlog_scaling_policy.node.default_child.\
+            add_property_override(
+                f"{self.__backlog_scaling_policy_configuration}.Metrics",
+                [
+                    *backlog_metrics,
+                    {
+                        "Id": "processed",
+                        "MetricStat": {
+                            "Metric": {
+                                "Dimensions": [
+                                    {
+                                        "Name": "service",
+                                        "Value": "event_processing",
+                                    },
+                                ],
+                                "MetricName": "ProcessedJobs",
+                                "Namespace": "EventProcessing",
+                            },
+                            "Stat": "Sum",
+                        },
+                        "ReturnData": False,
+                    },
+                    {
+                        "Id": "tasks",
+                        "MetricStat": {
+                            "Metric": {
+                                "Dimensions": [
+                                    {
+                                        "Name": "ClusterName",
+                                        "Value": self.
+                                        __event_processing_cluster.
+                                        cluster_name,
+                                    },
+                                    {
+                                        "Name": "ServiceName",
+                                        "Value": self.
+                                        __event_processing_service.
+                                        service.
+                                        service_name,
+                                    },
+                                ],
+                                "MetricName": "RunningTaskCount",
+                                "Namespace": "ECS/ContainerInsights",
+                            },
+                            "Stat": "Average",
+                        },
+                        "ReturnData": False,
+                    },
+                    {
+                        "Expression": (
+                            f"({' + '.join(backlog_terms)}) / "
+                            "IF(FILL(processed, 0) > 0, "
+                            "FILL(processed, 0) / 60, "
+                            f"tasks * {max_in_flight_jobs / job_duration})"
+                        ),
+                        "Id": "backlog",
+                        "Label": "Seconds to drain the backlog",
+                        "ReturnData": True,
+                    },
+                ],
+            )
+
+        if scale_to_zero:
+            visibles = {
+                f"visible_{index}":
+                queue.metric_approximate_number_of_messages_visible(
+                    statistic="Maximum",
+                )
+                for index, (queue, _) in enumerate(self.__lanes)
+            }
+            self.__wake_up_action = StepScalingAction(
+                self,
+                "WakeUpAction",
+                adjustment_type=AdjustmentType.CHANGE_IN_CAPACITY,
+                cooldown=Duration.seconds(scale_out_cooldown),
+                scaling_target=self.__event_processing_scalable_target,
+            )
+            self.__wake_up_alarm = Alarm(
+                self,
+                "WakeUpAlarm",
+                alarm_description=("Jobs are waiting while the event "
+                                   "processing service has no tasks"),
+                comparison_operator=ComparisonOperator.
+                GREATER_THAN_OR_EQUAL_TO_THRESHOLD,
+                evaluation_periods=1,
+                metric=MathExpression(
+                    expression=(
+                        "IF("
+                        f"({' + '.join(visibles)}) > 0 "
+                        "AND FILL(tasks, 0) == 0, 1, 0)"
+                    ),
+                    period=Duration.minutes(1),
+                    using_metrics={
+                        "tasks": Metric(
+                            dimensions_map={
+                                "ClusterName": self.
+                                __event_processing_cluster.
+                                cluster_name,
+                                "ServiceName": self.
+                                __event_processing_service.
+                                service.
+                                service_name,
+                            },
+                            metric_name="RunningTaskCount",
+                            namespace="ECS/ContainerInsights",
+                            statistic="Maximum",
+                        ),
+                        **visibles,
+                    },
+                ),
+                threshold=1,
+                treat_missing_data=TreatMissingData.NOT_BREACHING,
+            )
+
+            self.__wake_up_action.add_adjustment(
+                adjustment=1,
+                lower_bound=0,
+            )
+            self.__wake_up_alarm.add_alarm_action(
+                ApplicationScalingAction(self.__wake_up_action),
+            )
+
         self.__event_processing_service.cluster.apply_removal_policy(
             removal_policy,
         )
@@ -377,9 +859,246 @@ class EventProcessingConstruct(Construct):
                 ],
             )
         )
+        self.job_status_function.node.default_child.add_metadata(
+            "checkov",
+            {
+                "skip": [
+                    {
+                        "comment": ("This function is invoked "
+                                    "synchronously by the jobs API"),
+                        "id": "CKV_AWS_116",
+                    },
+                    {
+                        "comment": ("This function is not meant "
+                                    "to be run inside a VPC"),
+                        "id": "CKV_AWS_117",
+                    },
+                    {
+                        "comment": ("A customer managed key "
+                                    "is not required"),
+                        "id": "CKV_AWS_173",
+                    },
+                ],
+            },
+        )
+        self.jobs_table.grant_read_data(
+            self.job_status_function,
+        )
         self.jobs_table.grant_read_write_data(
             self.__error_handling_function,
         )
         self.jobs_table.grant_read_write_data(
             self.__event_processing_service.task_definition.task_role,
         )
+
+        if self.priority_queues:
+            self.__event_processing_service.task_definition.\
+                default_container.add_environment(
+                    "PRIORITY_QUEUES",
+                    Stack.of(self).to_json_string([
+                        {
+                            "name": queue.queue_name,
+                            "url": queue.queue_url,
+                            "weight": weight,
+                        }
+                        for queue, weight in self.__lanes[1:]
+                    ]),
+                )
+            self.__event_processing_service.task_definition.\
+                default_container.add_environment(
+                    "QUEUE_WEIGHT",
+                    str(self.__lanes[0][1]),
+                )
+
+        for queue in self.priority_queues.values():
+            queue.add_to_resource_policy(
+                PolicyStatement(
+                    actions=[
+                        "sqs:*",
+                    ],
+                    conditions={
+                        "Bool": {
+                            "aws:SecureTransport": "false",
+                        },
+                    },
+                    effect=Effect.DENY,
+                    principals=[
+                        AnyPrincipal(),
+                    ],
+                    resources=[
+                        queue.queue_arn,
+                    ],
+                )
+            )
+            queue.grant_consume_messages(
+                self.__event_processing_service.task_definition.task_role,
+            )
+
+        if result_cache:
+            self.__event_processing_container = self.\
+                __event_processing_service.\
+                task_definition.\
+                default_container
+            self.__result_cache_table = Table(
+                self,
+                "ResultCacheTable",
+                encryption=TableEncryption.CUSTOMER_MANAGED,
+                encryption_key=self.__jobs_table_key,
+                partition_key=Attribute(
+                    name="key",
+                    type=AttributeType.STRING,
+                ),
+                read_capacity=read_capacity,
+                removal_policy=removal_policy,
+                time_to_live_attribute="expires_at",
+                write_capacity=write_capacity,
+            )
+
+            self.__dynamo_db_gateway_endpoint.add_to_policy(
+                PolicyStatement(
+                    actions=[
+                        "dynamodb:GetItem",
+                        "dynamodb:PutItem",
+                    ],
+                    conditions={
+                        "ArnEquals": {
+                            "aws:PrincipalArn": self.
+                            __event_processing_service.
+                            task_definition.
+                            task_role.
+                            role_arn,
+                        }
+                    },
+                    effect=Effect.ALLOW,
+                    principals=[
+                        AnyPrincipal(),
+                    ],
+                    resources=[
+                        self.__result_cache_table.table_arn,
+                    ],
+                )
+            )
+            self.__event_processing_container.add_environment(
+                "RESULT_CACHE_SIZE",
+                str(result_cache_size),
+            )
+            self.__event_processing_container.add_environment(
+                "RESULT_CACHE_TABLE_NAME",
+                self.__result_cache_table.table_name,
+            )
+            self.__event_processing_container.add_environment(
+                "RESULT_CACHE_TTL",
+                str(result_cache_ttl),
+            )
+            self.__result_cache_table.grant_read_write_data(
+                self.__event_processing_service.task_definition.task_role,
+            )
+
+        if short_job_threshold > 0:
+            self.__short_jobs_timeout = \
+                short_job_threshold * short_jobs_batch_size + 30
+            self.short_jobs_queue = Queue(
+                self,
+                "ShortJobsQueue",
+                encryption=QueueEncryption.KMS,
+                encryption_master_key=self.__jobs_queue_key,
+                fifo=fifo,
+                queue_name=("short_jobs_queue.fifo" if fifo
+                            else "short_jobs_queue"),
+                dead_letter_queue=DeadLetterQueue(
+                    max_receive_count=max_receive_count,
+                    queue=self.__failed_jobs_dead_letter_queue,
+                ),
+                retention_period=Duration.seconds(max_event_age),
+                visibility_timeout=Duration.seconds(
+                    self.__short_jobs_timeout),
+            )
+            self.__short_jobs_function = Function(
+                self,
+                "ShortJobsFunction",
+                code=Code.from_asset(
+                    str(
+                        Path(__file__).
+                        parent.
+                        parent.
+                        parent.
+                        joinpath("short_jobs").
+                        resolve()
+                    ),
+                    bundling=BundlingOptions(
+                        command=[
+                            "bash",
+                            "-c",
+                            ("cp /asset-input/main.py "
+                             "--target /asset-output "
+                             "--update"),
+                        ],
+                        image=Runtime.PYTHON_3_9.bundling_image,
+                    ),
+                ),
+                environment={
+                    "TABLE_NAME": self.jobs_table.table_name,
+                    "TIMEOUT": str(short_job_threshold),
+                },
+                handler="main.handler",
+                layers=[
+                    self.__event_processing_layer,
+                    self.__powertools_layer,
+                ],
+                reserved_concurrent_executions=(
+                    reserved_concurrent_executions),
+                runtime=Runtime.PYTHON_3_9,
+                timeout=Duration.seconds(self.__short_jobs_timeout),
+            )
+
+            self.__short_jobs_function.add_event_source(
+                SqsEventSource(
+                    self.short_jobs_queue,
+                    batch_size=short_jobs_batch_size,
+                    report_batch_item_failures=True,
+                ),
+            )
+            self.__short_jobs_function.node.default_child.add_metadata(
+                "checkov",
+                {
+                    "skip": [
+                        {
+                            "comment": ("This function reports "
+                                        "batch item failures"),
+                            "id": "CKV_AWS_116",
+                        },
+                        {
+                            "comment": ("This function is not meant "
+                                        "to be run inside a VPC"),
+                            "id": "CKV_AWS_117",
+                        },
+                        {
+                            "comment": ("A customer managed key "
+                                        "is not required"),
+                            "id": "CKV_AWS_173",
+                        },
+                    ],
+                },
+            )
+            self.short_jobs_queue.add_to_resource_policy(
+                PolicyStatement(
+                    actions=[
+                        "sqs:*",
+                    ],
+                    conditions={
+                        "Bool": {
+                            "aws:SecureTransport": "false",
+                        },
+                    },
+                    effect=Effect.DENY,
+                    principals=[
+                        AnyPrincipal(),
+                    ],
+                    resources=[
+                        self.short_jobs_queue.queue_arn,
+                    ],
+                )
+            )
+            self.jobs_table.grant_read_write_data(
+                self.__short_jobs_function,
+            )
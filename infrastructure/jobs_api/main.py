@@ -13,16 +13,16 @@ from aws_cdk.aws_apigateway import (
     JsonSchema,
     JsonSchemaType,
     JsonSchemaVersion,
+    LambdaIntegration,
     LogGroupLogDestination,
+    MethodDeploymentOptions,
     MethodResponse,
     Model,
     PassthroughBehavior,
-    RequestValidatorOptions,
     RestApi,
     StageOptions,
-)
-from aws_cdk.aws_dynamodb import (
-    Table,
+    ThrottleSettings,
+    UsagePlanPerApiStage,
 )
 from aws_cdk.aws_iam import (
     AccountPrincipal,
@@ -35,6 +35,9 @@ from aws_cdk.aws_iam import (
 from aws_cdk.aws_kms import (
     Key,
 )
+from aws_cdk.aws_lambda import (
+    IFunction,
+)
 from aws_cdk.aws_logs import (
     LogGroup,
     RetentionDays,
@@ -51,6 +54,11 @@ from json import (
 from os import (
     getenv,
 )
+from typing import (
+    Optional,
+)
+
+MAX_BATCH_SIZE = 10
 
 
 class JobsApiConstruct(Construct):
@@ -58,16 +66,30 @@ class JobsApiConstruct(Construct):
         self,
         scope: Construct,
         construct_id: str,
+        cache_ttl: int = 0,
+        job_durations: Optional[dict] = None,
+        job_types: tuple = ("sleep",),
         pending_window: int = 7,
+        priorities: tuple = (),
         removal_policy: RemovalPolicy = RemovalPolicy.DESTROY,
         retention: RetentionDays = RetentionDays.ONE_MONTH,
+        short_job_threshold: int = 0,
+        short_job_types: tuple = ("sleep",),
         stage_name: str = "dev",
+        tenant_burst_limit: int = 20,
+        tenant_rate_limit: int = 10,
+        tenants: tuple = (),
     ) -> None:
         super().__init__(
             scope,
             construct_id,
         )
 
+        self.__api_key_required = bool(tenants)
+        self.__job_durations = job_durations or dict()
+        self.__short_job_threshold = short_job_threshold
+        self.__short_job_types = short_job_types
+
         self.__jobs_api_access_log_group_name = \
             "/aws/apigateway/JobsAPIAccessLogs"
         self.__jobs_api_access_log_key = Key(
@@ -94,6 +116,15 @@ class JobsApiConstruct(Construct):
                 access_log_destination=LogGroupLogDestination(
                     self.__jobs_api_access_log_group,
                 ),
+                cache_cluster_enabled=cache_ttl > 0,
+                cache_cluster_size="0.5" if cache_ttl > 0 else None,
+                method_options={
+                    "/jobs/{jobId}/GET": MethodDeploymentOptions(
+                        cache_data_encrypted=True,
+                        cache_ttl=Duration.seconds(cache_ttl),
+                        caching_enabled=True,
+                    ),
+                } if cache_ttl > 0 else None,
                 stage_name=stage_name,
                 tracing_enabled=True,
             ),
@@ -105,6 +136,51 @@ class JobsApiConstruct(Construct):
             self,
             "JobsAPIInvokeRolePolicy",
         )
+        self.__jobs_properties = {
+            "callback_url": JsonSchema(
+                pattern="^https://",
+                type=JsonSchemaType.STRING,
+            ),
+            **({
+                "priority": JsonSchema(
+                    enum=list(priorities),
+                    type=JsonSchemaType.STRING,
+                ),
+            } if priorities else dict()),
+            "seconds": JsonSchema(
+                minimum=1,
+                type=JsonSchemaType.INTEGER,
+            ),
+            "type": JsonSchema(
+                enum=list(job_types),
+                type=JsonSchemaType.STRING,
+            ),
+        }
+        self.__jobs_batch_request_model = Model(
+            self,
+            "JobsBatchRequestModel",
+            content_type="application/json",
+            description="Model for requests to /jobs:batch",
+            model_name="JobsBatchRequest",
+            rest_api=self.__jobs_api,
+            schema=JsonSchema(
+                items=JsonSchema(
+                    properties=self.__jobs_properties,
+                    type=JsonSchemaType.OBJECT,
+                ),
+                max_items=MAX_BATCH_SIZE,
+                min_items=1,
+                schema=JsonSchemaVersion.DRAFT4,
+                title="Jobs Batch Request Schema",
+                type=JsonSchemaType.ARRAY,
+            ),
+        )
+        self.__jobs_request_validator = \
+            self.__jobs_api.add_request_validator(
+                "JobsRequestValidator",
+                validate_request_body=True,
+                validate_request_parameters=False,
+            )
         self.__jobs_request_model = Model(
             self,
             "JobsRequestModel",
@@ -113,20 +189,31 @@ class JobsApiConstruct(Construct):
             model_name="JobsRequest",
             rest_api=self.__jobs_api,
             schema=JsonSchema(
-                properties={
-                    "seconds": JsonSchema(
-                        minimum=1,
-                        type=JsonSchemaType.INTEGER,
-                    ),
-                },
+                properties=self.__jobs_properties,
                 schema=JsonSchemaVersion.DRAFT4,
                 title="Jobs Request Schema",
                 type=JsonSchemaType.OBJECT,
             ),
         )
+        self.__job_id_template = "".join([
+            ("#set($jobId = "
+             "$input.params().header.get('Idempotency-Key'))"),
+            "#if(\"$!jobId\" == \"\")",
+            "#set($jobId = $context.requestId)",
+            "#{end}",
+        ])
+        self.__jobs_batch_resource = self.__jobs_api.root.add_resource(
+            "jobs:batch")
         self.__jobs_resource = self.__jobs_api.root.add_resource("jobs")
         self.__job_id_resource = self.__jobs_resource.add_resource("{jobId}")
         self.__passthrough_behavior = PassthroughBehavior.WHEN_NO_TEMPLATES
+        self.__tenant_template = "".join([
+            "#set($tenant = $context.identity.apiKeyId)",
+            "#if(\"$!tenant\" == \"\")",
+            "#set($tenant = $context.identity.caller)",
+            "#{end}",
+        ])
+        self.jobs_api_keys = dict()
         self.jobs_api_execution_role = Role(
             self,
             "JobsAPIExecutionRole",
@@ -138,68 +225,124 @@ class JobsApiConstruct(Construct):
             assumed_by=AccountPrincipal(Stack.of(self).account),
         )
 
-        self.__jobs_api.deployment_stage.node.default_child.add_metadata(
-            "checkov",
-            {
-                "skip": [
-                    {
-                        "comment": ("API Gateway caching "
-                                    "is not required"),
-                        "id": "CKV_AWS_120",
-                    },
+        if cache_ttl == 0:
+            self.__jobs_api.deployment_stage.node.default_child.add_metadata(
+                "checkov",
+                {
+                    "skip": [
+                        {
+                            "comment": ("API Gateway caching "
+                                        "is not required"),
+                            "id": "CKV_AWS_120",
+                        },
+                    ],
+                },
+            )
+
+        if tenants:
+            self.__jobs_usage_plan = self.__jobs_api.add_usage_plan(
+                "JobsUsagePlan",
+                api_stages=[
+                    UsagePlanPerApiStage(
+                        api=self.__jobs_api,
+                        stage=self.__jobs_api.deployment_stage,
+                    ),
                 ],
-            },
-        )
+                description="Per-tenant throttling of jobs submissions",
+                throttle=ThrottleSettings(
+                    burst_limit=tenant_burst_limit,
+                    rate_limit=tenant_rate_limit,
+                ),
+            )
+
+        for tenant in tenants:
+            self.jobs_api_keys[tenant] = self.__jobs_api.add_api_key(
+                f"JobsAPIKey-{tenant}",
+                api_key_name=tenant,
+            )
+
+            self.__jobs_usage_plan.add_api_key(self.jobs_api_keys[tenant])
+
         self.__jobs_api_invoke_role_policy.attach_to_role(
             self.jobs_api_invoke_role,
         )
 
+    def __queue_url_template(
+        self,
+        jobs: str,
+        jobs_queue: IQueue,
+        priority_queues: Optional[dict],
+        short_jobs_queue: Optional[IQueue],
+    ) -> str:
+        template = [
+            f"#set($queueUrl = \"{jobs_queue.queue_url}\")",
+        ]
+
+        if priority_queues:
+            template.extend([
+                "#set($priority = \"\")",
+                f"#foreach($job in {jobs})",
+                "#if($foreach.index == 0)",
+                "#set($priority = \"$!job.priority\")",
+                "#elseif(\"$!job.priority\" != $priority)",
+                "#set($priority = \"\")",
+                "#{end}",
+                "#{end}",
+                *[
+                    (f"#if($priority == \"{priority}\")"
+                     f"#set($queueUrl = \"{queue.queue_url}\")#{{end}}")
+                    for priority, queue in priority_queues.items()
+                ],
+            ])
+
+        if short_jobs_queue is not None:
+            template.extend([
+                "#set($short = true)",
+                f"#foreach($job in {jobs})",
+                "".join([
+                    "#if(\"$!job.type\" != \"\"",
+                    *[
+                        f" && \"$!job.type\" != \"{type}\""
+                        for type in self.__short_job_types
+                    ],
+                    ")#set($short = false)#{end}",
+                ]),
+                "#set($seconds = \"\")",
+                "#set($seconds = $job.seconds)",
+                "#if(\"$!seconds\" == \"\")",
+                *[
+                    (f"#if(\"$!job.type\" == \"{type}\")"
+                     f"#set($seconds = {duration})#{{end}}")
+                    for type, duration in self.__job_durations.items()
+                ],
+                "#{end}",
+                "#if(\"$!seconds\" == \"\")",
+                "#set($short = false)",
+                f"#elseif($seconds > {self.__short_job_threshold})",
+                "#set($short = false)",
+                "#{end}",
+                "#{end}",
+                "#if($short)",
+                f"#set($queueUrl = \"{short_jobs_queue.queue_url}\")",
+                "#{end}",
+            ])
+
+        return "".join(template)
+
     def add_job_id_method(
         self,
-        jobs_table: Table,
+        job_status_function: IFunction,
     ) -> None:
         __job_id_method = self.__job_id_resource.add_method(
             "GET",
             authorization_type=AuthorizationType.IAM,
-            integration=AwsIntegration(
-                action="GetItem",
-                options=IntegrationOptions(
-                    credentials_role=self.jobs_api_execution_role,
-                    passthrough_behavior=self.__passthrough_behavior,
-                    integration_responses=[
-                        IntegrationResponse(
-                            response_templates={
-                                "application/json": "\n".join([
-                                    ("#set($inputRoot = "
-                                     "$input.path('$').Item)"),
-                                    "{",
-                                    "  #if($inputRoot.parameters != $null)",
-                                    ("  \"parameters\": "
-                                     "$inputRoot.parameters.S,"),
-                                    "  #end",
-                                    "  #if($inputRoot.results != $null)",
-                                    ("  \"results\": "
-                                     "$inputRoot.results.S,"),
-                                    "  #end",
-                                    ("  \"status\": "
-                                     "\"$inputRoot.status.S\""),
-                                    "}",
-                                ]),
-                            },
-                            status_code="200",
-                        ),
-                    ],
-                    request_templates={
-                        "application/json": dumps({
-                            "Key": {
-                                "id": {
-                                    "S": "$input.params('jobId')",
-                                },
-                            },
-                            "TableName": jobs_table.table_name,
-                        }),
-                    }),
-                service="dynamodb",
+            integration=LambdaIntegration(
+                job_status_function,
+                cache_key_parameters=[
+                    "method.request.path.jobId",
+                    "method.request.querystring.wait",
+                ],
+                proxy=True,
             ),
             method_responses=[
                 MethodResponse(
@@ -212,6 +355,10 @@ class JobsApiConstruct(Construct):
                     status_code="200",
                 ),
             ],
+            request_parameters={
+                "method.request.path.jobId": True,
+                "method.request.querystring.wait": False,
+            },
         )
 
         self.__jobs_api_access_log_key.grant_encrypt_decrypt(
@@ -244,12 +391,156 @@ class JobsApiConstruct(Construct):
             ),
         )
 
+    def add_jobs_batch_method(
+        self,
+        jobs_queue: IQueue,
+        priority_queues: Optional[dict] = None,
+        short_jobs_queue: Optional[IQueue] = None,
+    ) -> None:
+        deduplication_parameters = list()
+        job_id = "$context.requestId-$foreach.index"
+
+        if jobs_queue.fifo:
+            deduplication_parameters = [
+                f"      \"MessageDeduplicationId\": \"{job_id}\",",
+                f"      \"MessageGroupId\": \"{job_id}\",",
+            ]
+
+        __jobs_batch_method = self.__jobs_batch_resource.add_method(
+            "POST",
+            api_key_required=self.__api_key_required,
+            authorization_type=AuthorizationType.IAM,
+            integration=AwsIntegration(
+                options=IntegrationOptions(
+                    credentials_role=self.jobs_api_execution_role,
+                    integration_responses=[
+                        IntegrationResponse(
+                            response_templates={
+                                "application/json": "\n".join([
+                                    "#set($response = $input.path('$'))",
+                                    "{",
+                                    "  \"failures\": [",
+                                    ("#foreach($entry in "
+                                     "$response.Failed)"),
+                                    "    {",
+                                    ("      \"code\": "
+                                     "\"$entry.Code\","),
+                                    ("      \"id\": "
+                                     "\"$context.requestId-$entry.Id\","),
+                                    ("      \"message\": "
+                                     "\"$util.escapeJavaScript("
+                                     "$entry.Message)\""),
+                                    "    }#if($foreach.hasNext),#end",
+                                    "#end",
+                                    "  ],",
+                                    "  \"ids\": [",
+                                    ("#foreach($entry in "
+                                     "$response.Successful)"),
+                                    ("    \"$context.requestId-$entry.Id\""
+                                     "#if($foreach.hasNext),#end"),
+                                    "#end",
+                                    "  ]",
+                                    "}",
+                                ]),
+                            },
+                            status_code="200",
+                        )
+                    ],
+                    passthrough_behavior=self.__passthrough_behavior,
+                    request_parameters={
+                        "integration.request.header.Content-Type":
+                        "'application/x-amz-json-1.0'",
+                        "integration.request.header.X-Amz-Target":
+                        "'AmazonSQS.SendMessageBatch'",
+                    },
+                    request_templates={
+                        "application/json": "\n".join([
+                            self.__tenant_template,
+                            self.__queue_url_template(
+                                "$input.path('$')",
+                                jobs_queue,
+                                priority_queues,
+                                short_jobs_queue,
+                            ),
+                            "{",
+                            "  \"Entries\": [",
+                            "#foreach($job in $input.path('$'))",
+                            "    {",
+                            "      \"Id\": \"$foreach.index\",",
+                            *deduplication_parameters,
+                            "      \"MessageAttributes\": {",
+                            "        \"id\": {",
+                            "          \"DataType\": \"String\",",
+                            f"          \"StringValue\": \"{job_id}\"",
+                            "        },",
+                            "        \"tenant\": {",
+                            "          \"DataType\": \"String\",",
+                            ("          \"StringValue\": "
+                             "\"$util.escapeJavaScript($tenant)\""),
+                            "        }",
+                            "      },",
+                            ("      \"MessageBody\": "
+                             "\"$util.escapeJavaScript("
+                             "$input.json(\"$[$foreach.index]\"))."
+                             "replaceAll(\"\\\\'\", \"'\")\""),
+                            "    }#if($foreach.hasNext),#end",
+                            "#end",
+                            "  ],",
+                            "  \"QueueUrl\": \"$queueUrl\"",
+                            "}",
+                        ]),
+                    },
+                ),
+                path=(f"{getenv('CDK_DEFAULT_ACCOUNT')}"
+                      f"/{jobs_queue.queue_name}"),
+                proxy=False,
+                service="sqs",
+            ),
+            request_models={
+                "application/json": self.__jobs_batch_request_model,
+            },
+            request_validator=self.__jobs_request_validator,
+        )
+
+        __jobs_batch_method.add_method_response(
+            response_models={
+                "application/json": Model.EMPTY_MODEL,
+            },
+            response_parameters={
+                "method.response.header.Content-Type": True,
+            },
+            status_code="200",
+        )
+        self.__jobs_api_invoke_role_policy.add_statements(
+            PolicyStatement(
+                actions=[
+                    "execute-api:Invoke",
+                ],
+                effect=Effect.ALLOW,
+                resources=[
+                    __jobs_batch_method.method_arn,
+                ],
+            ),
+        )
+
     def add_jobs_method(
         self,
         jobs_queue: IQueue,
+        priority_queues: Optional[dict] = None,
+        short_jobs_queue: Optional[IQueue] = None,
     ) -> None:
+        deduplication_parameters = list()
+        job_id = "$util.escapeJavaScript($jobId)"
+
+        if jobs_queue.fifo:
+            deduplication_parameters = [
+                f"  \"MessageDeduplicationId\": \"{job_id}\",",
+                f"  \"MessageGroupId\": \"{job_id}\",",
+            ]
+
         __jobs_method = self.__jobs_resource.add_method(
             "POST",
+            api_key_required=self.__api_key_required,
             authorization_type=AuthorizationType.IAM,
             integration=AwsIntegration(
                 options=IntegrationOptions(
@@ -257,9 +548,12 @@ class JobsApiConstruct(Construct):
                     integration_responses=[
                         IntegrationResponse(
                             response_templates={
-                                "application/json": dumps({
-                                    "id": "$context.requestId",
-                                }),
+                                "application/json": "".join([
+                                    self.__job_id_template,
+                                    dumps({
+                                        "id": "$jobId",
+                                    }),
+                                ]),
                             },
                             status_code="200",
                         )
@@ -267,18 +561,39 @@ class JobsApiConstruct(Construct):
                     passthrough_behavior=self.__passthrough_behavior,
                     request_parameters={
                         "integration.request.header.Content-Type":
-                        "'application/x-www-form-urlencoded'",
+                        "'application/x-amz-json-1.0'",
+                        "integration.request.header.X-Amz-Target":
+                        "'AmazonSQS.SendMessage'",
                     },
                     request_templates={
-                        "application/json":
-                        ("Action="
-                         "SendMessage&MessageBody="
-                         "$input.json('$')&"
-                         "MessageAttribute.1.Name="
-                         "id&"
-                         "MessageAttribute.1.Value.StringValue="
-                         "$context.requestId&"
-                         "MessageAttribute.1.Value.DataType=String"),
+                        "application/json": "\n".join([
+                            self.__job_id_template,
+                            self.__tenant_template,
+                            self.__queue_url_template(
+                                "[$input.path('$')]",
+                                jobs_queue,
+                                priority_queues,
+                                short_jobs_queue,
+                            ),
+                            "{",
+                            *deduplication_parameters,
+                            "  \"MessageAttributes\": {",
+                            "    \"id\": {",
+                            "      \"DataType\": \"String\",",
+                            f"      \"StringValue\": \"{job_id}\"",
+                            "    },",
+                            "    \"tenant\": {",
+                            "      \"DataType\": \"String\",",
+                            ("      \"StringValue\": "
+                             "\"$util.escapeJavaScript($tenant)\""),
+                            "    }",
+                            "  },",
+                            ("  \"MessageBody\": "
+                             "\"$util.escapeJavaScript($input.json('$'))."
+                             "replaceAll(\"\\\\'\", \"'\")\","),
+                            "  \"QueueUrl\": \"$queueUrl\"",
+                            "}",
+                        ]),
                     },
                 ),
                 path=(f"{getenv('CDK_DEFAULT_ACCOUNT')}"
@@ -289,10 +604,10 @@ class JobsApiConstruct(Construct):
             request_models={
                 "application/json": self.__jobs_request_model,
             },
-            request_validator_options=RequestValidatorOptions(
-                validate_request_body=True,
-                validate_request_parameters=False,
-            ),
+            request_parameters={
+                "method.request.header.Idempotency-Key": False,
+            },
+            request_validator=self.__jobs_request_validator,
         )
 
         __jobs_method.add_method_response(
@@ -15,6 +15,9 @@ from infrastructure.event_processing.main import (
 from infrastructure.jobs_api.main import (
     JobsApiConstruct,
 )
+from typing import (
+    Optional,
+)
 
 
 class InfrastructureStack(Stack):
@@ -22,18 +25,55 @@ class InfrastructureStack(Stack):
         self,
         scope: Construct,
         construct_id: str,
+        backlog_latency_target: int = 60,
+        cache_ttl: int = 0,
+        cpu: int = 256,
+        default_priority: str = "normal",
+        drain_timeout: int = 90,
+        error_handling_batch_size: int = 100,
+        error_handling_max_batching_window: int = 30,
+        error_handling_max_concurrency: int = 2,
         error_handling_timeout: int = 300,
         event_processing_timeout: int = 300,
+        fifo: bool = False,
+        job_duration: int = 10,
+        job_durations: Optional[dict] = None,
+        job_status_max_wait: int = 20,
+        job_types: tuple = ("sleep",),
         max_event_age: int = 21600,
+        max_in_flight_jobs: int = 10,
+        max_receive_count: int = 2,
         max_service_capacity: int = 5,
+        memory_limit_mib: int = 1024,
         min_service_capacity: int = 1,
+        multi_process: bool = False,
+        notification_batch_size: int = 100,
+        notification_retry_attempts: int = 2,
+        notification_timeout: int = 60,
         pending_window: int = 7,
+        prefetch_size: int = 10,
+        priorities: Optional[dict] = None,
         read_capacity: int = 5,
+        receive_wait_time: int = 20,
         removal_policy: RemovalPolicy = RemovalPolicy.DESTROY,
+        result_cache: bool = False,
+        result_cache_size: int = 1024,
+        result_cache_ttl: int = 86400,
         reserved_concurrent_executions: int = 100,
         retention: RetentionDays = RetentionDays.ONE_MONTH,
         retry_attempts: int = 0,
+        scale_in_cooldown: int = 300,
+        scale_out_cooldown: int = 60,
+        scale_to_zero: bool = False,
+        short_job_threshold: int = 0,
+        short_job_types: tuple = ("sleep",),
+        short_jobs_batch_size: int = 10,
         stage_name: str = "dev",
+        stop_timeout: int = 120,
+        tenant_burst_limit: int = 20,
+        tenant_rate_limit: int = 10,
+        tenants: tuple = (),
+        worker_processes: Optional[int] = None,
         write_capacity: int = 5,
         **kwargs,
     ) -> None:
@@ -46,43 +86,124 @@ class InfrastructureStack(Stack):
         self.__event_processing = EventProcessingConstruct(
             self,
             "EventProcessing",
+            backlog_latency_target=backlog_latency_target,
+            cpu=cpu,
+            default_priority=default_priority,
+            drain_timeout=drain_timeout,
+            error_handling_batch_size=error_handling_batch_size,
+            error_handling_max_batching_window=(
+                error_handling_max_batching_window),
+            error_handling_max_concurrency=error_handling_max_concurrency,
             error_handling_timeout=error_handling_timeout,
             event_processing_timeout=event_processing_timeout,
+            fifo=fifo,
+            job_duration=job_duration,
+            job_status_max_wait=job_status_max_wait,
             max_event_age=max_event_age,
+            max_in_flight_jobs=max_in_flight_jobs,
+            max_receive_count=max_receive_count,
             max_service_capacity=max_service_capacity,
+            memory_limit_mib=memory_limit_mib,
             min_service_capacity=min_service_capacity,
+            multi_process=multi_process,
+            notification_batch_size=notification_batch_size,
+            notification_retry_attempts=notification_retry_attempts,
+            notification_timeout=notification_timeout,
             pending_window=pending_window,
+            prefetch_size=prefetch_size,
+            priorities=priorities,
             read_capacity=read_capacity,
+            receive_wait_time=receive_wait_time,
             removal_policy=removal_policy,
+            result_cache=result_cache,
+            result_cache_size=result_cache_size,
+            result_cache_ttl=result_cache_ttl,
             reserved_concurrent_executions=reserved_concurrent_executions,
             retention=retention,
             retry_attempts=retry_attempts,
+            scale_in_cooldown=scale_in_cooldown,
+            scale_out_cooldown=scale_out_cooldown,
+            scale_to_zero=scale_to_zero,
+            short_job_threshold=short_job_threshold,
+            short_jobs_batch_size=short_jobs_batch_size,
+            stop_timeout=stop_timeout,
+            worker_processes=worker_processes,
             write_capacity=write_capacity,
         )
         self.__jobs_api = JobsApiConstruct(
             self,
             "JobsApi",
+            cache_ttl=cache_ttl,
+            job_durations=job_durations,
+            job_types=job_types,
             pending_window=pending_window,
+            priorities=tuple(priorities or ()),
             removal_policy=removal_policy,
             retention=retention,
+            short_job_threshold=short_job_threshold,
+            short_job_types=short_job_types,
             stage_name=stage_name,
+            tenant_burst_limit=tenant_burst_limit,
+            tenant_rate_limit=tenant_rate_limit,
+            tenants=tenants,
         )
 
+        CfnOutput(
+            self,
+            "CompletedJobsEventBus",
+            value=self.
+            __event_processing.
+            completed_jobs_event_bus.
+            event_bus_name,
+        )
         CfnOutput(
             self,
             "JobsAPIInvokeRole",
             value=self.__jobs_api.jobs_api_invoke_role.role_arn,
         )
+
+        for tenant, api_key in self.__jobs_api.jobs_api_keys.items():
+            CfnOutput(
+                self,
+                f"JobsAPIKey-{tenant}",
+                value=api_key.key_id,
+            )
+
         self.__event_processing.jobs_queue.grant_send_messages(
             self.__jobs_api.jobs_api_execution_role)
-        self.__event_processing.jobs_table.grant_read_data(
-            self.__jobs_api.jobs_api_execution_role)
+
+        for queue in self.__event_processing.priority_queues.values():
+            queue.grant_send_messages(
+                self.__jobs_api.jobs_api_execution_role)
+
+        if self.__event_processing.short_jobs_queue is not None:
+            self.__event_processing.short_jobs_queue.grant_send_messages(
+                self.__jobs_api.jobs_api_execution_role)
+
         self.__jobs_api.add_job_id_method(
-            jobs_table=self.__event_processing.jobs_table)
+            job_status_function=self.
+            __event_processing.
+            job_status_function)
+        self.__jobs_api.add_jobs_batch_method(
+            jobs_queue=self.
+            __event_processing.
+            jobs_queue,
+            priority_queues=self.
+            __event_processing.
+            priority_queues,
+            short_jobs_queue=self.
+            __event_processing.
+            short_jobs_queue)
         self.__jobs_api.add_jobs_method(
             jobs_queue=self.
             __event_processing.
-            jobs_queue)
+            jobs_queue,
+            priority_queues=self.
+            __event_processing.
+            priority_queues,
+            short_jobs_queue=self.
+            __event_processing.
+            short_jobs_queue)
         self.add_metadata(
             "cfn-lint", {
                 "config": {
@@ -0,0 +1,149 @@
+from aws_lambda_powertools.utilities.typing import (
+    LambdaContext,
+)
+from aws_lambda_powertools import (
+    Logger,
+)
+from boto3 import (
+    client,
+)
+from hashlib import (
+    sha256,
+)
+from json import (
+    dumps,
+    loads,
+)
+from os import (
+    getenv,
+)
+from time import (
+    monotonic,
+    sleep,
+)
+from typing import (
+    Optional,
+)
+
+FINAL_CACHE_CONTROL = "private, max-age=31536000, immutable"
+FINAL_STATUSES = [
+    "Failure",
+    "Success",
+]
+INITIAL_BACKOFF = float(getenv("INITIAL_BACKOFF", "0.1"))
+MAX_BACKOFF = float(getenv("MAX_BACKOFF", "2"))
+MAX_WAIT = int(getenv("MAX_WAIT", "20"))
+TABLE_NAME = getenv("TABLE_NAME")
+TIMESTAMPS = [
+    "completed_at",
+    "queued_at",
+    "started_at",
+    "updated_at",
+]
+dynamodb = client("dynamodb")
+logger = Logger(
+    level=getenv("LOG_LEVEL", "INFO"),
+    service="job_status",
+)
+
+
+def get_job(id: str) -> Optional[dict]:
+    response = dynamodb.get_item(
+        ConsistentRead=True,
+        Key={
+            "id": {
+                "S": id,
+            },
+        },
+        TableName=TABLE_NAME,
+    )
+
+    return response.get("Item")
+
+
+def get_header(event: dict, name: str) -> Optional[str]:
+    for header, value in (event.get("headers") or dict()).items():
+        if header.lower() == name.lower():
+            return value
+
+    return None
+
+
+def response(
+    status_code: int,
+    body: Optional[dict],
+    headers: dict = dict(),
+) -> dict:
+    return {
+        "body": "" if body is None else dumps(body),
+        "headers": {
+            "Content-Type": "application/json",
+            **headers,
+        },
+        "statusCode": status_code,
+    }
+
+
+def handler(event: dict, context: LambdaContext) -> dict:
+    logger.debug(event)
+
+    id = event["pathParameters"]["jobId"]
+    query_parameters = event.get("queryStringParameters") or dict()
+
+    try:
+        wait = min(max(int(query_parameters.get("wait", "0")), 0), MAX_WAIT)
+    except ValueError:
+        return response(400, {
+            "message": "wait must be an integer number of seconds",
+        })
+
+    backoff = INITIAL_BACKOFF
+    deadline = monotonic() + wait
+    item = get_job(id)
+
+    while item is None or \
+            item.get("status", dict()).get("S") not in FINAL_STATUSES:
+        remaining = deadline - monotonic()
+
+        if remaining <= 0:
+            break
+
+        sleep(min(backoff, remaining))
+
+        backoff = min(backoff * 2, MAX_BACKOFF)
+        item = get_job(id)
+
+    if item is None:
+        return response(404, {
+            "message": f"Job {id} not found",
+        })
+
+    body = dict()
+
+    for name in ["parameters", "results"]:
+        if name in item:
+            body[name] = loads(item[name]["S"])
+
+    if "progress" in item:
+        body["progress"] = float(item["progress"]["N"])
+
+    body["status"] = item["status"]["S"]
+
+    for name in TIMESTAMPS:
+        if name in item:
+            body[name] = item[name]["S"]
+    etag = f"\"{sha256(dumps(body, sort_keys=True).encode()).hexdigest()}\""
+    headers = {
+        "Cache-Control": FINAL_CACHE_CONTROL
+        if body["status"] in FINAL_STATUSES else "no-cache",
+        "ETag": etag,
+    }
+    if_none_match = get_header(event, "If-None-Match") or ""
+
+    if etag in [
+        tag.strip().removeprefix("W/")
+        for tag in if_none_match.split(",")
+    ] or if_none_match.strip() == "*":
+        return response(304, None, headers)
+
+    return response(200, body, headers)
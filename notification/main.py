@@ -0,0 +1,151 @@
+from aws_lambda_powertools.utilities.typing import (
+    LambdaContext,
+)
+from aws_lambda_powertools import (
+    Logger,
+)
+from boto3 import (
+    client,
+)
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    wait,
+)
+from json import (
+    dumps,
+)
+from os import (
+    getenv,
+)
+from urllib.request import (
+    Request,
+    urlopen,
+)
+
+CALLBACK_TIMEOUT = int(getenv("CALLBACK_TIMEOUT", "5"))
+CALLBACKS_CONCURRENCY = int(getenv("CALLBACKS_CONCURRENCY", "10"))
+CALLBACKS_MARGIN = 5
+EVENT_BUS_NAME = getenv("EVENT_BUS_NAME")
+FINAL_STATUSES = [
+    "Failure",
+    "Success",
+]
+MAX_BATCH_SIZE = 10
+events = client("events")
+logger = Logger(
+    level=getenv("LOG_LEVEL", "INFO"),
+    service="notification",
+)
+
+
+def notify_callback(callback_url: str, detail: dict) -> None:
+    if not callback_url.startswith(("http://", "https://")):
+        raise ValueError(f"Callback URL {callback_url} not supported")
+
+    request = Request(
+        callback_url,
+        data=dumps(detail).encode(),
+        headers={
+            "Content-Type": "application/json",
+        },
+        method="POST",
+    )
+
+    with urlopen(request, timeout=CALLBACK_TIMEOUT):  # nosec
+        pass
+
+
+def notify_callbacks(callbacks: list, timeout: float) -> None:
+    if not callbacks:
+        return
+
+    executor = ThreadPoolExecutor(max_workers=CALLBACKS_CONCURRENCY)
+    futures = {
+        executor.submit(notify_callback, callback_url, detail): detail["id"]
+        for callback_url, detail in callbacks
+    }
+    done, not_done = wait(futures, timeout=max(timeout, 0))
+
+    executor.shutdown(cancel_futures=True, wait=False)
+
+    for future in done:
+        if future.exception() is not None:
+            logger.warning((f"Job {futures[future]} callback failed "
+                            f"with exception: {future.exception()}"))
+
+    for future in not_done:
+        logger.warning(f"Job {futures[future]} callback timed out")
+
+
+def handler(event: dict, context: LambdaContext) -> dict:
+    logger.debug(event)
+
+    batch_item_failures = list()
+    callbacks = list()
+    notifications = list()
+
+    for record in event["Records"]:
+        new_image = record["dynamodb"].get("NewImage", dict())
+        old_image = record["dynamodb"].get("OldImage", dict())
+        status = new_image.get("status", dict()).get("S")
+
+        if status not in FINAL_STATUSES or \
+                status == old_image.get("status", dict()).get("S"):
+            continue
+
+        detail = {
+            "id": new_image["id"]["S"],
+            "status": status,
+        }
+
+        notifications.append((record, detail))
+
+    for index in range(0, len(notifications), MAX_BATCH_SIZE):
+        batch = notifications[index:index + MAX_BATCH_SIZE]
+
+        try:
+            response = events.put_events(
+                Entries=[
+                    {
+                        "Detail": dumps(detail),
+                        "DetailType": "Job Completed",
+                        "EventBusName": EVENT_BUS_NAME,
+                        "Source": "event_processing",
+                    }
+                    for _, detail in batch
+                ],
+            )
+            entries = response["Entries"]
+        except Exception as exception:
+            logger.error(("Notifications publishing failed "
+                          f"with exception: {exception}"))
+
+            entries = [
+                {
+                    "ErrorCode": "Exception",
+                }
+                for _ in batch
+            ]
+
+        for (record, detail), entry in zip(batch, entries):
+            new_image = record["dynamodb"]["NewImage"]
+
+            if "ErrorCode" in entry:
+                batch_item_failures.append(
+                    record["dynamodb"]["SequenceNumber"])
+            elif "callback_url" in new_image:
+                callbacks.append((new_image["callback_url"]["S"], detail))
+
+    notify_callbacks(
+        callbacks,
+        context.get_remaining_time_in_millis() / 1000 - CALLBACKS_MARGIN,
+    )
+
+    return {
+        "batchItemFailures": [
+            {
+                "itemIdentifier": sequence_number,
+            }
+            for sequence_number in batch_item_failures
+        ],
+    }
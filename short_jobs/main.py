@@ -0,0 +1,108 @@
+from aws_lambda_powertools.utilities.typing import (
+    LambdaContext,
+)
+from aws_lambda_powertools import (
+    Logger,
+)
+from boto3 import (
+    client,
+)
+from collections import (
+    defaultdict,
+)
+from event_processing.handlers.main import (
+    HandlerRegistry,
+    JobHandler,
+)
+from event_processing.main import (
+    TYPE,
+    event_processing,
+)
+from event_processing.results.main import (
+    ResultWriter,
+)
+from json import (
+    loads,
+)
+from os import (
+    getenv,
+)
+
+TABLE_NAME = getenv("TABLE_NAME")
+dynamodb = client("dynamodb")
+handlers = HandlerRegistry(
+    default_type=TYPE,
+    handlers=[
+        JobHandler(
+            handler=event_processing,
+            type=TYPE,
+        ),
+    ],
+)
+logger = Logger(
+    level=getenv("LOG_LEVEL", "INFO"),
+    service="short_jobs",
+)
+result_writer = ResultWriter(
+    dynamodb=dynamodb,
+    logger=logger,
+    table_name=TABLE_NAME,
+)
+
+
+def handler(event: dict, context: LambdaContext) -> dict:
+    logger.debug(event)
+
+    batch_item_failures = list()
+    items = list()
+    message_ids = defaultdict(list)
+
+    for record in event["Records"]:
+        message_id = record["messageId"]
+
+        try:
+            message = {
+                "Body": loads(record["body"]),
+                "MessageAttributes": {
+                    name: {
+                        "DataType": attribute["dataType"],
+                        "StringValue": attribute["stringValue"],
+                    }
+                    for name, attribute in record["messageAttributes"].items()
+                },
+                "MessageId": message_id,
+                "ReceiptHandle": record["receiptHandle"],
+            }
+            item = handlers.resolve(message).handler(message)
+        except Exception as exception:
+            logger.error((f"Record {message_id} processing failed "
+                          f"with exception: {exception}"))
+            batch_item_failures.append(message_id)
+
+            continue
+
+        if isinstance(message["Body"], dict) and \
+                "callback_url" in message["Body"]:
+            item["callback_url"] = {
+                "S": str(message["Body"]["callback_url"]),
+            }
+
+        items.append(item)
+        message_ids[item["id"]["S"]].append(message_id)
+
+    unprocessed_items = result_writer.write_items(items)
+
+    for item in unprocessed_items:
+        batch_item_failures.extend(message_ids[item["id"]["S"]])
+
+    if unprocessed_items:
+        logger.error(f"{len(unprocessed_items)} items writing failed")
+
+    return {
+        "batchItemFailures": [
+            {
+                "itemIdentifier": message_id,
+            }
+            for message_id in batch_item_failures
+        ],
+    }
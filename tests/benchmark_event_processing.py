@@ -0,0 +1,54 @@
+from event_processing.main import (
+    decode,
+)
+from json import (
+    dumps,
+    loads,
+)
+from timeit import (
+    repeat,
+)
+
+NUMBER = 10000
+REPEAT = 5
+MESSAGE = {
+    "Attributes": {
+        "ApproximateFirstReceiveTimestamp": "1666090800000",
+        "ApproximateReceiveCount": "1",
+        "SenderId": "AROAEXAMPLE:BackplaneAssumeRoleSession",
+        "SentTimestamp": "1666090799000",
+    },
+    "Body": dumps({
+        "seconds": 1,
+    }),
+    "MD5OfBody": "9a1e6b7fb1b4c2d3f5e3c4a9b8d7e6f5",
+    "MD5OfMessageAttributes": "4c2d3f5e3c4a9b8d7e6f59a1e6b7fb1b",
+    "MessageAttributes": {
+        "id": {
+            "DataType": "String",
+            "StringValue": "c6a1e0f4-5b8d-4f4e-9a8b-0d3f3c1e2a7b",
+        },
+    },
+    "MessageId": "5fea7756-0ea4-451a-a703-a558b933e274",
+    "ReceiptHandle": "MbZj6wDWli+JvwwJaBV+3dcjk2YW2vA3+STFFljTM8tJJg6HRG6PY"
+                     "SasuWXPJB+CwLj1FjgXUv1uSj1gUPAWV66FU/WeR4mq2OKpEGYWb",
+}
+
+
+def benchmark(strict: bool) -> float:
+    def decode_message() -> None:
+        event = dict(MESSAGE)
+        event["Body"] = loads(event["Body"])
+
+        decode(event, strict=strict)
+
+    return min(repeat(decode_message, number=NUMBER, repeat=REPEAT)) / NUMBER
+
+
+if __name__ == "__main__":
+    fast = benchmark(strict=False)
+    strict = benchmark(strict=True)
+
+    print(f"fast:   {fast * 1e6:.2f} us/message")
+    print(f"strict: {strict * 1e6:.2f} us/message")
+    print(f"speedup: {strict / fast:.1f}x")
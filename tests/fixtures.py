@@ -1,6 +1,19 @@
+from aws_lambda_powertools import (
+    Logger,
+    Metrics,
+)
 from aws_lambda_powertools.utilities.typing import (
     LambdaContext,
 )
+from boto3 import (
+    client,
+)
+from botocore.client import (
+    BaseClient,
+)
+from event_processing.metrics.main import (
+    MetricsPublisher,
+)
 from pytest import (
     fixture,
 )
@@ -11,3 +24,36 @@ def context() -> LambdaContext:
     context = LambdaContext()
 
     yield context
+
+
+@fixture
+def dynamodb() -> BaseClient:
+    dynamodb = client("dynamodb")
+
+    yield dynamodb
+
+
+@fixture
+def logger() -> Logger:
+    logger = Logger(service="event_processing")
+
+    yield logger
+
+
+@fixture
+def metrics() -> MetricsPublisher:
+    metrics = MetricsPublisher(
+        metrics=Metrics(
+            namespace="EventProcessing",
+            service="event_processing",
+        ),
+    )
+
+    yield metrics
+
+
+@fixture
+def sqs_client() -> BaseClient:
+    sqs_client = client("sqs")
+
+    yield sqs_client
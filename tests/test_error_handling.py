@@ -2,6 +2,7 @@ from aws_lambda_powertools.utilities.typing import (
     LambdaContext,
 )
 from botocore.stub import (
+    ANY,
     Stubber,
 )
 from error_handling.main import (
@@ -26,20 +27,38 @@ def dynamodb_stub(event: dict) -> Stubber:
     parameters = record["body"]
 
     dynamodb_stub.add_response(
-        "put_item",
+        "update_item",
         expected_params={
-            "Item": {
-                "id": {
-                    "S": "1",
+            "ConditionExpression": ("attribute_not_exists(id) OR "
+                                    "#status <> :success"),
+            "ExpressionAttributeNames": {
+                "#parameters": "parameters",
+                "#status": "status",
+            },
+            "ExpressionAttributeValues": {
+                ":failure": {
+                    "S": "Failure",
+                },
+                ":now": {
+                    "S": ANY,
                 },
-                "parameters": {
+                ":parameters": {
                     "S": dumps(parameters),
                 },
-                "status": {
-                    "S": "Failure",
+                ":success": {
+                    "S": "Success",
+                },
+            },
+            "Key": {
+                "id": {
+                    "S": "1",
                 },
             },
             "TableName": "jobs",
+            "UpdateExpression": ("SET #parameters = :parameters, "
+                                 "#status = :failure, "
+                                 "completed_at = :now, "
+                                 "updated_at = :now"),
         },
         service_response=dict(),
     )
@@ -62,6 +81,16 @@ def event() -> dict:
                         "stringValue": "1",
                     },
                 },
+                "messageId": "1",
+            },
+            {
+                "body": {
+                    "parameters": {
+                        "seconds": 302,
+                    },
+                },
+                "messageAttributes": dict(),
+                "messageId": "2",
             },
         ]
     }
@@ -75,4 +104,38 @@ def test_error_handling(
     event: dict,
 ) -> None:
     with dynamodb_stub:
-        handler(event, context)
+        response = handler(event, context)
+
+    dynamodb_stub.assert_no_pending_responses()
+    assert response == {  # nosec
+        "batchItemFailures": [
+            {
+                "itemIdentifier": "2",
+            },
+        ],
+    }
+
+
+def test_error_handling_keeps_succeeded_jobs(
+    context: LambdaContext,
+    event: dict,
+) -> None:
+    dynamodb_stub = Stubber(dynamodb)
+
+    dynamodb_stub.add_client_error(
+        "update_item",
+        expected_params=None,
+        service_error_code="ConditionalCheckFailedException",
+    )
+
+    with dynamodb_stub:
+        response = handler(event, context)
+
+    dynamodb_stub.assert_no_pending_responses()
+    assert response == {  # nosec
+        "batchItemFailures": [
+            {
+                "itemIdentifier": "2",
+            },
+        ],
+    }
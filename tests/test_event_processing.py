@@ -1,10 +1,7 @@
-from botocore.stub import (
-    Stubber,
-)
 from event_processing.main import (
     Event,
     Parameters,
-    dynamodb,
+    decode,
     event_processing,
 )
 from os import (
@@ -12,38 +9,10 @@ from os import (
 )
 from pytest import (
     fixture,
+    raises,
 )
 
 
-@fixture
-def dynamodb_stub(event_success: Event) -> Stubber:
-    dynamodb_stub = Stubber(dynamodb)
-    parameters = event_success.Body
-    seconds = parameters.seconds
-    message = f"I slept for {seconds} seconds"
-
-    dynamodb_stub.add_response(
-        "put_item",
-        expected_params={
-            "Item": {
-                "id": {
-                    "S": "2",
-                },
-                "results": {
-                    "S": f"{{\"message\": \"{message}\"}}",
-                },
-                "status": {
-                    "S": "Success",
-                },
-            },
-            "TableName": "jobs",
-        },
-        service_response=dict(),
-    )
-
-    yield dynamodb_stub
-
-
 @fixture
 def event_failure() -> Event:
     event_failure = Event(
@@ -84,6 +53,26 @@ def event_success() -> Event:
     yield event_success
 
 
+@fixture
+def item(event_success: Event) -> dict:
+    parameters = event_success.Body
+    seconds = parameters.seconds
+    message = f"I slept for {seconds} seconds"
+    item = {
+        "id": {
+            "S": "2",
+        },
+        "results": {
+            "S": f"{{\"message\": \"{message}\"}}",
+        },
+        "status": {
+            "S": "Success",
+        },
+    }
+
+    yield item
+
+
 def test_job_processing_failure(
     event_failure: Event,
 ) -> None:
@@ -92,7 +81,7 @@ def test_job_processing_failure(
         seconds = parameters.seconds
         timeout = int(getenv("TIMEOUT"))
 
-        event_processing(event_failure)
+        event_processing(event_failure.dict())
     except ValueError as value_error:
         error_message = value_error.args[0]
 
@@ -100,8 +89,40 @@ def test_job_processing_failure(
 
 
 def test_job_processing_success(
-    dynamodb_stub: Stubber,
+    event_success: Event,
+    item: dict,
+) -> None:
+    assert event_processing(event_success.dict()) == item  # nosec
+
+
+def test_job_processing_reports_progress(
+    event_success: Event,
+    item: dict,
+) -> None:
+    progress = list()
+
+    assert event_processing(  # nosec
+        event_success.dict(),
+        report_progress=progress.append,
+    ) == item
+    assert progress == [1.0]  # nosec
+
+
+def test_job_decoding_failure(
     event_success: Event,
 ) -> None:
-    with dynamodb_stub:
-        event_processing(event_success)
+    event = event_success.dict()
+    event["Body"]["seconds"] = "1"
+
+    with raises(ValueError):
+        decode(event)
+
+
+def test_job_decoding_strict(
+    event_success: Event,
+) -> None:
+    fast_job = decode(event_success.dict())
+    strict_job = decode(event_success.dict(), strict=True)
+
+    assert (fast_job.id, fast_job.seconds) == \
+        (strict_job.id, strict_job.seconds)  # nosec
@@ -0,0 +1,285 @@
+from asyncio import (
+    Event,
+    get_running_loop,
+    run,
+)
+from aws_lambda_powertools import (
+    Logger,
+)
+from botocore.client import (
+    BaseClient,
+)
+from botocore.stub import (
+    Stubber,
+)
+from event_processing.acknowledgement.main import (
+    AckCoalescer,
+)
+from pytest import (
+    fixture,
+)
+from tests.fixtures import (
+    logger,
+    sqs_client,
+)
+
+
+@fixture
+def ack_coalescer(logger: Logger, sqs_client: BaseClient) -> AckCoalescer:
+    ack_coalescer = AckCoalescer(
+        logger=logger,
+        max_delay=60,
+        sqs_client=sqs_client,
+    )
+
+    yield ack_coalescer
+
+
+def delete_message_batch_response(ids: range) -> dict:
+    return {
+        "Failed": [],
+        "Successful": [
+            {
+                "Id": str(id),
+            }
+            for id in ids
+        ],
+    }
+
+
+def entries(ids: range) -> list:
+    return [
+        {
+            "Id": str(index),
+            "ReceiptHandle": str(id),
+        }
+        for index, id in enumerate(ids)
+    ]
+
+
+def test_ack_coalescer_batches_per_queue(
+    ack_coalescer: AckCoalescer,
+    sqs_client: BaseClient,
+) -> None:
+    batches = list()
+    sqs_stub = Stubber(sqs_client)
+
+    sqs_client.meta.events.register(
+        "before-parameter-build.sqs.DeleteMessageBatch",
+        lambda params, **kwargs: batches.append(params),
+    )
+
+    for _ in range(2):
+        sqs_stub.add_response(
+            "delete_message_batch",
+            expected_params=None,
+            service_response=delete_message_batch_response(range(2)),
+        )
+
+    async def acknowledge() -> None:
+        for queue_url in ["queue-a", "queue-b", "queue-a", "queue-b"]:
+            ack_coalescer.acknowledge(queue_url, queue_url)
+
+        await ack_coalescer.stop()
+
+    with sqs_stub:
+        run(acknowledge())
+
+    sqs_stub.assert_no_pending_responses()
+    assert sorted(batches, key=lambda batch: batch["QueueUrl"]) == [  # nosec
+        {
+            "Entries": [
+                {
+                    "Id": str(index),
+                    "ReceiptHandle": queue_url,
+                }
+                for index in range(2)
+            ],
+            "QueueUrl": queue_url,
+        }
+        for queue_url in ["queue-a", "queue-b"]
+    ]
+
+
+def test_ack_coalescer_flushes_on_max_delay(
+    logger: Logger,
+    sqs_client: BaseClient,
+) -> None:
+    ack_coalescer = AckCoalescer(
+        logger=logger,
+        max_delay=0.05,
+        sqs_client=sqs_client,
+    )
+    sqs_stub = Stubber(sqs_client)
+
+    sqs_stub.add_response(
+        "delete_message_batch",
+        expected_params={
+            "Entries": entries(range(1)),
+            "QueueUrl": "queue",
+        },
+        service_response=delete_message_batch_response(range(1)),
+    )
+
+    async def acknowledge() -> None:
+        deleted = Event()
+        loop = get_running_loop()
+
+        sqs_client.meta.events.register(
+            "after-call.sqs.DeleteMessageBatch",
+            lambda **kwargs: loop.call_soon_threadsafe(deleted.set),
+        )
+        ack_coalescer.start()
+        ack_coalescer.acknowledge("queue", "0")
+
+        await deleted.wait()
+
+        sqs_stub.assert_no_pending_responses()
+
+        await ack_coalescer.stop()
+
+    with sqs_stub:
+        run(acknowledge())
+
+
+def test_ack_coalescer_flushes_on_max_batch_size(
+    ack_coalescer: AckCoalescer,
+    sqs_client: BaseClient,
+) -> None:
+    sqs_stub = Stubber(sqs_client)
+
+    sqs_stub.add_response(
+        "delete_message_batch",
+        expected_params={
+            "Entries": entries(range(10)),
+            "QueueUrl": "queue",
+        },
+        service_response=delete_message_batch_response(range(10)),
+    )
+    sqs_stub.add_response(
+        "delete_message_batch",
+        expected_params={
+            "Entries": entries(range(10, 11)),
+            "QueueUrl": "queue",
+        },
+        service_response=delete_message_batch_response(range(1)),
+    )
+
+    async def acknowledge() -> None:
+        deleted = Event()
+        loop = get_running_loop()
+
+        sqs_client.meta.events.register(
+            "after-call.sqs.DeleteMessageBatch",
+            lambda **kwargs: loop.call_soon_threadsafe(deleted.set),
+        )
+
+        for id in range(11):
+            ack_coalescer.acknowledge("queue", str(id))
+
+        await deleted.wait()
+        await ack_coalescer.stop()
+
+    with sqs_stub:
+        run(acknowledge())
+
+    sqs_stub.assert_no_pending_responses()
+
+
+def test_ack_coalescer_flushes_on_shutdown(
+    ack_coalescer: AckCoalescer,
+    sqs_client: BaseClient,
+) -> None:
+    sqs_stub = Stubber(sqs_client)
+
+    sqs_stub.add_response(
+        "delete_message_batch",
+        expected_params={
+            "Entries": [
+                {
+                    "Id": str(id),
+                    "ReceiptHandle": str(id),
+                }
+                for id in range(2)
+            ],
+            "QueueUrl": "queue",
+        },
+        service_response={
+            "Failed": [],
+            "Successful": [
+                {
+                    "Id": str(id),
+                }
+                for id in range(2)
+            ],
+        },
+    )
+
+    async def acknowledge() -> None:
+        ack_coalescer.start()
+
+        for id in range(2):
+            ack_coalescer.acknowledge("queue", str(id))
+
+        await ack_coalescer.stop()
+
+    with sqs_stub:
+        run(acknowledge())
+
+    sqs_stub.assert_no_pending_responses()
+
+
+def test_ack_coalescer_retries_failed_entries(
+    ack_coalescer: AckCoalescer,
+    sqs_client: BaseClient,
+) -> None:
+    sqs_stub = Stubber(sqs_client)
+
+    sqs_stub.add_response(
+        "delete_message_batch",
+        expected_params={
+            "Entries": [
+                {
+                    "Id": str(id),
+                    "ReceiptHandle": str(id),
+                }
+                for id in range(10)
+            ],
+            "QueueUrl": "queue",
+        },
+        service_response={
+            "Failed": [
+                {
+                    "Code": "InternalError",
+                    "Id": "7",
+                    "SenderFault": False,
+                },
+            ],
+            "Successful": [
+                {
+                    "Id": str(id),
+                }
+                for id in range(10)
+                if id != 7
+            ],
+        },
+    )
+    sqs_stub.add_response(
+        "delete_message",
+        expected_params={
+            "QueueUrl": "queue",
+            "ReceiptHandle": "7",
+        },
+        service_response=dict(),
+    )
+
+    async def acknowledge() -> None:
+        for id in range(10):
+            ack_coalescer.acknowledge("queue", str(id))
+
+        await ack_coalescer.stop()
+
+    with sqs_stub:
+        run(acknowledge())
+
+    sqs_stub.assert_no_pending_responses()
@@ -0,0 +1,181 @@
+from asyncio import (
+    run,
+)
+from aws_lambda_powertools import (
+    Logger,
+)
+from botocore.client import (
+    BaseClient,
+)
+from botocore.stub import (
+    ANY,
+    Stubber,
+)
+from event_processing.caching.main import (
+    ResultCache,
+)
+from event_processing.metrics.main import (
+    MetricsPublisher,
+)
+from pytest import (
+    CaptureFixture,
+    fixture,
+)
+from tests.fixtures import (
+    dynamodb,
+    logger,
+    metrics,
+)
+from time import (
+    time,
+)
+
+
+@fixture
+def attributes() -> dict:
+    attributes = {
+        "results": {
+            "S": "{\"message\": \"I slept for 1 seconds\"}",
+        },
+        "status": {
+            "S": "Success",
+        },
+    }
+
+    yield attributes
+
+
+@fixture
+def result_cache(
+    dynamodb: BaseClient,
+    logger: Logger,
+    metrics: MetricsPublisher,
+) -> ResultCache:
+    result_cache = ResultCache(
+        dynamodb=dynamodb,
+        logger=logger,
+        max_size=1,
+        metrics=metrics,
+        table_name="cache",
+    )
+
+    yield result_cache
+
+
+def test_result_cache_keys_canonical_parameters(
+    result_cache: ResultCache,
+) -> None:
+    parameters = {
+        "seconds": 1,
+        "type": "sleep",
+    }
+    reordered_parameters = {
+        "type": "sleep",
+        "seconds": 1,
+    }
+    key = result_cache.key("sleep", "1", parameters)
+
+    assert key == result_cache.key("sleep", "1", reordered_parameters)  # nosec
+    assert key != result_cache.key("sleep", "2", parameters)  # nosec
+
+
+def test_result_cache_reads_shared_tier(
+    attributes: dict,
+    capsys: CaptureFixture,
+    dynamodb: BaseClient,
+    metrics: MetricsPublisher,
+    result_cache: ResultCache,
+) -> None:
+    dynamodb_stub = Stubber(dynamodb)
+
+    dynamodb_stub.add_response(
+        "get_item",
+        expected_params={
+            "Key": {
+                "key": {
+                    "S": "0",
+                },
+            },
+            "TableName": "cache",
+        },
+        service_response={
+            "Item": {
+                "attributes": {
+                    "M": attributes,
+                },
+                "expires_at": {
+                    "N": str(int(time()) + 60),
+                },
+                "key": {
+                    "S": "0",
+                },
+            },
+        },
+    )
+
+    async def get() -> list:
+        return [await result_cache.get("0") for _ in range(2)]
+
+    with dynamodb_stub:
+        cached = run(get())
+
+    metrics.flush()
+
+    output = capsys.readouterr().out
+
+    dynamodb_stub.assert_no_pending_responses()
+    assert cached == [attributes, attributes]  # nosec
+    assert "ResultCacheLocalHits" in output  # nosec
+    assert "ResultCacheSharedHits" in output  # nosec
+
+
+def test_result_cache_writes_both_tiers(
+    attributes: dict,
+    capsys: CaptureFixture,
+    dynamodb: BaseClient,
+    metrics: MetricsPublisher,
+    result_cache: ResultCache,
+) -> None:
+    dynamodb_stub = Stubber(dynamodb)
+
+    dynamodb_stub.add_response(
+        "get_item",
+        expected_params=None,
+        service_response=dict(),
+    )
+    dynamodb_stub.add_response(
+        "put_item",
+        expected_params={
+            "Item": {
+                "attributes": {
+                    "M": attributes,
+                },
+                "expires_at": {
+                    "N": ANY,
+                },
+                "key": {
+                    "S": "0",
+                },
+            },
+            "TableName": "cache",
+        },
+        service_response=dict(),
+    )
+
+    async def put() -> list:
+        cached = [await result_cache.get("0")]
+
+        await result_cache.put("0", attributes)
+
+        cached.append(await result_cache.get("0"))
+
+        return cached
+
+    with dynamodb_stub:
+        cached = run(put())
+
+    metrics.flush()
+
+    dynamodb_stub.assert_no_pending_responses()
+    assert cached == [None, attributes]  # nosec
+    assert "ResultCacheMisses" in capsys.readouterr().out  # nosec
@@ -0,0 +1,103 @@
+from event_processing.handlers.main import (
+    HandlerRegistry,
+    JobHandler,
+)
+from pydantic import (
+    BaseModel,
+)
+from pytest import (
+    fixture,
+    raises,
+)
+
+
+class Parameters(BaseModel):
+    seconds: int
+
+
+class Resize(BaseModel):
+    height: int
+    width: int
+
+
+@fixture
+def handlers() -> HandlerRegistry:
+    handlers = HandlerRegistry(
+        default_type="sleep",
+        handlers=[
+            JobHandler(
+                handler=dict,
+                model=Parameters,
+                type="sleep",
+            ),
+            JobHandler(
+                handler=dict,
+                max_in_flight_jobs=1,
+                model=Resize,
+                type="resize",
+            ),
+        ],
+    )
+
+    yield handlers
+
+
+def test_handlers_resolve_by_attribute(handlers: HandlerRegistry) -> None:
+    handler = handlers.resolve({
+        "Body": {
+            "type": "sleep",
+        },
+        "MessageAttributes": {
+            "type": {
+                "DataType": "String",
+                "StringValue": "resize",
+            },
+        },
+    })
+
+    assert handler.type == "resize"  # nosec
+
+
+def test_handlers_resolve_by_body(handlers: HandlerRegistry) -> None:
+    handler = handlers.resolve({
+        "Body": {
+            "height": 1,
+            "type": "resize",
+            "width": 1,
+        },
+        "MessageAttributes": dict(),
+    })
+
+    assert handler.type == "resize"  # nosec
+
+
+def test_handlers_resolve_default(handlers: HandlerRegistry) -> None:
+    handler = handlers.resolve({
+        "Body": {
+            "seconds": 1,
+        },
+        "MessageAttributes": dict(),
+    })
+
+    assert handler.type == "sleep"  # nosec
+
+
+def test_handlers_reject_duplicates(handlers: HandlerRegistry) -> None:
+    with raises(ValueError):
+        handlers.register(
+            JobHandler(
+                handler=dict,
+                model=Parameters,
+                type="sleep",
+            ),
+        )
+
+
+def test_handlers_reject_unknown_types(handlers: HandlerRegistry) -> None:
+    with raises(ValueError):
+        handlers.resolve({
+            "Body": {
+                "type": "unknown",
+            },
+            "MessageAttributes": dict(),
+        })
@@ -0,0 +1,192 @@
+from asyncio import (
+    Event,
+    get_running_loop,
+    run,
+    sleep,
+)
+from aws_lambda_powertools import (
+    Logger,
+)
+from botocore.client import (
+    BaseClient,
+)
+from botocore.stub import (
+    Stubber,
+)
+from event_processing.heartbeat.main import (
+    VisibilityHeartbeat,
+)
+from event_processing.metrics.main import (
+    MetricsPublisher,
+)
+from tests.fixtures import (
+    logger,
+    metrics,
+    sqs_client,
+)
+
+
+def change_message_visibility_batch_params(
+    receipt_handles: list,
+    visibility_timeout: int,
+) -> dict:
+    return {
+        "Entries": [
+            {
+                "Id": str(index),
+                "ReceiptHandle": receipt_handle,
+                "VisibilityTimeout": visibility_timeout,
+            }
+            for index, receipt_handle in enumerate(receipt_handles)
+        ],
+        "QueueUrl": "queue",
+    }
+
+
+def change_message_visibility_batch_response(receipt_handles: list) -> dict:
+    return {
+        "Failed": [],
+        "Successful": [
+            {
+                "Id": str(index),
+            }
+            for index, _ in enumerate(receipt_handles)
+        ],
+    }
+
+
+def test_heartbeat_extends_in_flight_messages(
+    logger: Logger,
+    metrics: MetricsPublisher,
+    sqs_client: BaseClient,
+) -> None:
+    heartbeat = VisibilityHeartbeat(
+        interval=0.05,
+        logger=logger,
+        metrics=metrics,
+        sqs_client=sqs_client,
+        visibility_timeout=300,
+    )
+    receipt_handles = [str(id) for id in range(12)]
+    sqs_stub = Stubber(sqs_client)
+
+    sqs_stub.add_response(
+        "change_message_visibility_batch",
+        expected_params=change_message_visibility_batch_params(
+            receipt_handles[:10],
+            300,
+        ),
+        service_response=change_message_visibility_batch_response(
+            receipt_handles[:10]),
+    )
+    sqs_stub.add_response(
+        "change_message_visibility_batch",
+        expected_params=change_message_visibility_batch_params(
+            receipt_handles[10:],
+            300,
+        ),
+        service_response=change_message_visibility_batch_response(
+            receipt_handles[10:]),
+    )
+
+    async def beat() -> None:
+        extended = Event()
+        loop = get_running_loop()
+        calls = list()
+
+        def count(**kwargs) -> None:
+            calls.append(kwargs)
+
+            if len(calls) == 2:
+                loop.call_soon_threadsafe(extended.set)
+
+        sqs_client.meta.events.register(
+            "after-call.sqs.ChangeMessageVisibilityBatch",
+            count,
+        )
+
+        for receipt_handle in receipt_handles:
+            heartbeat.track("queue", receipt_handle)
+
+        heartbeat.start()
+
+        await extended.wait()
+
+        heartbeat.stop()
+
+    with sqs_stub:
+        run(beat())
+
+    sqs_stub.assert_no_pending_responses()
+
+
+def test_heartbeat_extends_only_expiring_messages(
+    logger: Logger,
+    metrics: MetricsPublisher,
+    sqs_client: BaseClient,
+) -> None:
+    heartbeat = VisibilityHeartbeat(
+        interval=0.05,
+        logger=logger,
+        metrics=metrics,
+        sqs_client=sqs_client,
+        visibility_margin=30,
+        visibility_timeout=300,
+    )
+    calls = list()
+    sqs_stub = Stubber(sqs_client)
+
+    sqs_stub.add_response(
+        "change_message_visibility_batch",
+        expected_params=change_message_visibility_batch_params(["0"], 300),
+        service_response=change_message_visibility_batch_response(["0"]),
+    )
+
+    async def beat() -> None:
+        sqs_client.meta.events.register(
+            "before-parameter-build.sqs.ChangeMessageVisibilityBatch",
+            lambda **kwargs: calls.append(kwargs),
+        )
+        heartbeat.track("queue", "0")
+        heartbeat.start()
+
+        await sleep(0.3)
+
+        heartbeat.stop()
+
+    with sqs_stub:
+        run(beat())
+
+    sqs_stub.assert_no_pending_responses()
+    assert len(calls) == 1  # nosec
+
+
+def test_heartbeat_releases_messages(
+    logger: Logger,
+    metrics: MetricsPublisher,
+    sqs_client: BaseClient,
+) -> None:
+    heartbeat = VisibilityHeartbeat(
+        logger=logger,
+        metrics=metrics,
+        sqs_client=sqs_client,
+    )
+    sqs_stub = Stubber(sqs_client)
+
+    sqs_stub.add_response(
+        "change_message_visibility_batch",
+        expected_params=change_message_visibility_batch_params(["0"], 0),
+        service_response=change_message_visibility_batch_response(["0"]),
+    )
+
+    with sqs_stub:
+        run(heartbeat.release([
+            (
+                "queue",
+                {
+                    "ReceiptHandle": "0",
+                },
+            ),
+        ]))
+
+    sqs_stub.assert_no_pending_responses()
@@ -0,0 +1,351 @@
+from asyncio import (
+    Event,
+    get_running_loop,
+    run,
+)
+from aws_lambda_powertools import (
+    Logger,
+)
+from botocore.client import (
+    BaseClient,
+)
+from botocore.stub import (
+    Stubber,
+)
+from event_processing.metrics.main import (
+    MetricsPublisher,
+)
+from event_processing.receiving.main import (
+    Receiver,
+    WeightedReceiver,
+)
+from pytest import (
+    CaptureFixture,
+    fixture,
+)
+from tests.fixtures import (
+    logger,
+    metrics,
+    sqs_client,
+)
+
+
+@fixture
+def messages() -> list:
+    messages = [
+        {
+            "Body": "{}",
+            "MessageId": str(id),
+            "ReceiptHandle": str(id),
+        }
+        for id in range(3)
+    ]
+
+    yield messages
+
+
+@fixture
+def receive_message_params() -> dict:
+    receive_message_params = {
+        "MessageAttributeNames": [
+            "All",
+        ],
+        "QueueUrl": "queue",
+        "WaitTimeSeconds": 20,
+    }
+
+    yield receive_message_params
+
+
+def test_receiver_extends_expiring_messages(
+    capsys: CaptureFixture,
+    logger: Logger,
+    messages: list,
+    metrics: MetricsPublisher,
+    receive_message_params: dict,
+    sqs_client: BaseClient,
+) -> None:
+    receiver = Receiver(
+        logger=logger,
+        metrics=metrics,
+        prefetch_size=2,
+        queue_name="queue",
+        queue_url="queue",
+        sqs_client=sqs_client,
+        visibility_margin=1,
+        visibility_timeout=1,
+    )
+    sqs_stub = Stubber(sqs_client)
+
+    sqs_stub.add_response(
+        "receive_message",
+        expected_params={
+            "MaxNumberOfMessages": 2,
+            **receive_message_params,
+        },
+        service_response={
+            "Messages": messages[:2],
+        },
+    )
+    sqs_stub.add_client_error(
+        "change_message_visibility",
+        expected_params={
+            "QueueUrl": "queue",
+            "ReceiptHandle": "0",
+            "VisibilityTimeout": 1,
+        },
+        service_error_code="ReceiptHandleIsInvalid",
+    )
+    sqs_stub.add_response(
+        "change_message_visibility",
+        expected_params={
+            "QueueUrl": "queue",
+            "ReceiptHandle": "1",
+            "VisibilityTimeout": 1,
+        },
+        service_response=dict(),
+    )
+
+    async def receive() -> tuple:
+        receiver.start()
+
+        item = await receiver.get()
+
+        receiver.stop()
+
+        return item
+
+    with sqs_stub:
+        item = run(receive())
+
+    metrics.flush()
+
+    output = capsys.readouterr().out
+
+    assert item == ("queue", messages[1])  # nosec
+    assert "PrefetchedMessagesDropped" in output  # nosec
+    assert "PrefetchedMessagesExtended" in output  # nosec
+
+
+def test_receiver_refreshes_queue_url(
+    capsys: CaptureFixture,
+    logger: Logger,
+    messages: list,
+    metrics: MetricsPublisher,
+    receive_message_params: dict,
+    sqs_client: BaseClient,
+) -> None:
+    receiver = Receiver(
+        logger=logger,
+        metrics=metrics,
+        prefetch_size=len(messages),
+        queue_name="queue",
+        queue_url="queue",
+        sqs_client=sqs_client,
+    )
+    sqs_stub = Stubber(sqs_client)
+
+    sqs_stub.add_client_error(
+        "receive_message",
+        expected_params={
+            "MaxNumberOfMessages": len(messages),
+            **receive_message_params,
+        },
+        service_error_code="AWS.SimpleQueueService.NonExistentQueue",
+    )
+    sqs_stub.add_response(
+        "get_queue_url",
+        expected_params={
+            "QueueName": "queue",
+        },
+        service_response={
+            "QueueUrl": "queue",
+        },
+    )
+    sqs_stub.add_response(
+        "receive_message",
+        expected_params={
+            "MaxNumberOfMessages": len(messages),
+            **receive_message_params,
+        },
+        service_response={
+            "Messages": messages,
+        },
+    )
+
+    async def receive() -> list:
+        receiver.start()
+
+        items = [await receiver.get() for _ in messages]
+
+        receiver.stop()
+
+        return items
+
+    with sqs_stub:
+        items = run(receive())
+
+    metrics.flush()
+
+    assert items == [("queue", message) for message in messages]  # nosec
+    assert "QueueUrlRefreshes" in capsys.readouterr().out  # nosec
+
+
+def test_receiver_stops_prefetching_when_full(
+    logger: Logger,
+    messages: list,
+    metrics: MetricsPublisher,
+    receive_message_params: dict,
+    sqs_client: BaseClient,
+) -> None:
+    receiver = Receiver(
+        logger=logger,
+        metrics=metrics,
+        prefetch_size=2,
+        queue_name="queue",
+        queue_url="queue",
+        sqs_client=sqs_client,
+    )
+    sqs_stub = Stubber(sqs_client)
+
+    sqs_stub.add_response(
+        "receive_message",
+        expected_params={
+            "MaxNumberOfMessages": 2,
+            **receive_message_params,
+        },
+        service_response={
+            "Messages": messages[:2],
+        },
+    )
+    sqs_stub.add_response(
+        "receive_message",
+        expected_params={
+            "MaxNumberOfMessages": 1,
+            **receive_message_params,
+        },
+        service_response={
+            "Messages": messages[2:],
+        },
+    )
+
+    async def receive() -> list:
+        loop = get_running_loop()
+        receives = list()
+        refilling = Event()
+
+        def count(**kwargs) -> None:
+            receives.append(kwargs)
+
+            if len(receives) == 2:
+                loop.call_soon_threadsafe(refilling.set)
+
+        sqs_client.meta.events.register(
+            "before-parameter-build.sqs.ReceiveMessage",
+            count,
+        )
+        receiver.start()
+
+        items = [await receiver.get()]
+
+        await refilling.wait()
+
+        items.extend([await receiver.get() for _ in messages[1:]])
+
+        receiver.stop()
+
+        return items
+
+    with sqs_stub:
+        items = run(receive())
+
+    sqs_stub.assert_no_pending_responses()
+    assert items == [("queue", message) for message in messages]  # nosec
+
+
+def test_receiver_round_robins_tenants(
+    logger: Logger,
+    metrics: MetricsPublisher,
+    receive_message_params: dict,
+    sqs_client: BaseClient,
+) -> None:
+    receiver = Receiver(
+        logger=logger,
+        metrics=metrics,
+        prefetch_size=4,
+        queue_name="queue",
+        queue_url="queue",
+        sqs_client=sqs_client,
+    )
+    sqs_stub = Stubber(sqs_client)
+    tenant_messages = [
+        {
+            "Body": "{}",
+            "MessageAttributes": {
+                "tenant": {
+                    "DataType": "String",
+                    "StringValue": tenant,
+                },
+            },
+            "MessageId": str(id),
+            "ReceiptHandle": str(id),
+        }
+        for id, tenant in enumerate(["noisy", "noisy", "noisy", "quiet"])
+    ]
+
+    sqs_stub.add_response(
+        "receive_message",
+        expected_params={
+            "MaxNumberOfMessages": 4,
+            **receive_message_params,
+        },
+        service_response={
+            "Messages": tenant_messages,
+        },
+    )
+
+    async def receive() -> list:
+        receiver.start()
+
+        items = [await receiver.get() for _ in tenant_messages]
+
+        receiver.stop()
+
+        return items
+
+    with sqs_stub:
+        items = run(receive())
+
+    assert [message["MessageId"] for _, message in items] == \
+        ["0", "3", "1", "2"]  # nosec
+
+
+class BufferedReceiver:
+    def __init__(self, name: str, size: int) -> None:
+        self.__items = [(name, str(id)) for id in range(size)]
+
+    async def get(self) -> tuple:
+        return self.__items.pop(0)
+
+    def ready(self) -> bool:
+        return bool(self.__items)
+
+    async def wait(self) -> None:
+        pass
+
+
+def test_weighted_receiver_shares_lanes_by_weight() -> None:
+    receiver = WeightedReceiver(
+        receivers=[
+            (BufferedReceiver("high", 8), 3),
+            (BufferedReceiver("low", 8), 1),
+        ],
+    )
+
+    async def receive() -> list:
+        return [(await receiver.get())[0] for _ in range(12)]
+
+    lanes = run(receive())
+
+    assert lanes[:8] == ["high", "high", "low", "high"] * 2  # nosec
+    assert lanes[8:] == ["high", "high", "low", "low"]  # nosec
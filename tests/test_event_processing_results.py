@@ -0,0 +1,393 @@
+from asyncio import (
+    Event,
+    create_task,
+    gather,
+    get_running_loop,
+    run,
+    sleep,
+)
+from aws_lambda_powertools import (
+    Logger,
+)
+from botocore.client import (
+    BaseClient,
+)
+from botocore.stub import (
+    ANY,
+    Stubber,
+)
+from event_processing.results.main import (
+    ResultWriter,
+)
+from pytest import (
+    fixture,
+)
+from tests.fixtures import (
+    dynamodb,
+    logger,
+)
+
+
+def put_requests(items: list) -> list:
+    return [
+        {
+            "PutRequest": {
+                "Item": item,
+            },
+        }
+        for item in items
+    ]
+
+
+@fixture
+def items() -> list:
+    items = [
+        {
+            "id": {
+                "S": str(id),
+            },
+            "status": {
+                "S": "Success",
+            },
+        }
+        for id in range(30)
+    ]
+
+    yield items
+
+
+@fixture
+def result_writer(dynamodb: BaseClient, logger: Logger) -> ResultWriter:
+    result_writer = ResultWriter(
+        base_backoff=0,
+        dynamodb=dynamodb,
+        logger=logger,
+        max_delay=60,
+        table_name="jobs",
+    )
+
+    yield result_writer
+
+
+def test_result_writer_batches_writes(
+    dynamodb: BaseClient,
+    items: list,
+    result_writer: ResultWriter,
+) -> None:
+    dynamodb_stub = Stubber(dynamodb)
+
+    dynamodb_stub.add_response(
+        "batch_write_item",
+        expected_params={
+            "RequestItems": {
+                "jobs": put_requests(items[:25]),
+            },
+        },
+        service_response=dict(),
+    )
+    dynamodb_stub.add_response(
+        "batch_write_item",
+        expected_params={
+            "RequestItems": {
+                "jobs": put_requests(items[25:]),
+            },
+        },
+        service_response=dict(),
+    )
+
+    async def write() -> None:
+        loop = get_running_loop()
+        written = Event()
+
+        dynamodb.meta.events.register(
+            "after-call.dynamodb.BatchWriteItem",
+            lambda **kwargs: loop.call_soon_threadsafe(written.set),
+        )
+        result_writer.start()
+
+        writes = gather(*[result_writer.write(item) for item in items])
+
+        await sleep(0)
+        await written.wait()
+        await result_writer.stop()
+        await writes
+
+    with dynamodb_stub:
+        run(write())
+
+    dynamodb_stub.assert_no_pending_responses()
+
+
+def test_result_writer_retries_unprocessed_items(
+    dynamodb: BaseClient,
+    items: list,
+    result_writer: ResultWriter,
+) -> None:
+    dynamodb_stub = Stubber(dynamodb)
+
+    dynamodb_stub.add_response(
+        "batch_write_item",
+        expected_params={
+            "RequestItems": {
+                "jobs": put_requests(items[:2]),
+            },
+        },
+        service_response={
+            "UnprocessedItems": {
+                "jobs": put_requests(items[1:2]),
+            },
+        },
+    )
+    dynamodb_stub.add_response(
+        "batch_write_item",
+        expected_params={
+            "RequestItems": {
+                "jobs": put_requests(items[1:2]),
+            },
+        },
+        service_response=dict(),
+    )
+
+    with dynamodb_stub:
+        unprocessed_items = result_writer.write_items(items[:2])
+
+    dynamodb_stub.assert_no_pending_responses()
+    assert unprocessed_items == list()  # nosec
+
+
+def test_result_writer_retries_throttled_writes(
+    dynamodb: BaseClient,
+    items: list,
+    result_writer: ResultWriter,
+) -> None:
+    dynamodb_stub = Stubber(dynamodb)
+
+    dynamodb_stub.add_client_error(
+        "batch_write_item",
+        expected_params={
+            "RequestItems": {
+                "jobs": put_requests(items[:2]),
+            },
+        },
+        service_error_code="ProvisionedThroughputExceededException",
+    )
+    dynamodb_stub.add_response(
+        "batch_write_item",
+        expected_params={
+            "RequestItems": {
+                "jobs": put_requests(items[:2]),
+            },
+        },
+        service_response=dict(),
+    )
+
+    with dynamodb_stub:
+        unprocessed_items = result_writer.write_items(items[:2])
+
+    dynamodb_stub.assert_no_pending_responses()
+    assert unprocessed_items == list()  # nosec
+
+
+def test_result_writer_coalesces_progress(
+    dynamodb: BaseClient,
+    logger: Logger,
+) -> None:
+    dynamodb_stub = Stubber(dynamodb)
+    result_writer = ResultWriter(
+        dynamodb=dynamodb,
+        logger=logger,
+        progress_interval=0.1,
+        table_name="jobs",
+    )
+
+    dynamodb_stub.add_response(
+        "update_item",
+        expected_params={
+            "ConditionExpression": ("version = :version AND "
+                                    "#status IN (:progress, :running)"),
+            "ExpressionAttributeNames": {
+                "#a0": "progress",
+                "#a1": "status",
+                "#status": "status",
+            },
+            "ExpressionAttributeValues": {
+                ":a0": {
+                    "N": "0.75",
+                },
+                ":a1": {
+                    "S": "Progress",
+                },
+                ":now": {
+                    "S": ANY,
+                },
+                ":progress": {
+                    "S": "Progress",
+                },
+                ":running": {
+                    "S": "Running",
+                },
+                ":version": {
+                    "N": "2",
+                },
+            },
+            "Key": {
+                "id": {
+                    "S": "1",
+                },
+            },
+            "TableName": "jobs",
+            "UpdateExpression": ("SET #a0 = :a0, #a1 = :a1, "
+                                 "updated_at = :now"),
+        },
+        service_response=dict(),
+    )
+
+    async def report() -> None:
+        loop = get_running_loop()
+        reported = Event()
+
+        dynamodb.meta.events.register(
+            "after-call.dynamodb.UpdateItem",
+            lambda **kwargs: loop.call_soon_threadsafe(reported.set),
+        )
+        result_writer.start()
+
+        for progress in [0.25, 0.5, 0.75]:
+            result_writer.report_progress("1", 2, progress)
+
+        await reported.wait()
+        await result_writer.stop()
+
+    with dynamodb_stub:
+        run(report())
+
+    dynamodb_stub.assert_no_pending_responses()
+
+
+def test_result_writer_discards_superseded_results(
+    dynamodb: BaseClient,
+    items: list,
+    result_writer: ResultWriter,
+) -> None:
+    dynamodb_stub = Stubber(dynamodb)
+
+    dynamodb_stub.add_client_error(
+        "update_item",
+        expected_params=None,
+        service_error_code="ConditionalCheckFailedException",
+    )
+
+    with dynamodb_stub:
+        written = run(result_writer.write(items[0], version=1))
+
+    dynamodb_stub.assert_no_pending_responses()
+    assert not written  # nosec
+
+
+def test_result_writer_claims_queued_jobs(
+    dynamodb: BaseClient,
+    result_writer: ResultWriter,
+) -> None:
+    dynamodb_stub = Stubber(dynamodb)
+
+    dynamodb_stub.add_response(
+        "update_item",
+        expected_params={
+            "ConditionExpression": ("attribute_not_exists(id) OR "
+                                    "(#status <> :success AND "
+                                    "(attribute_not_exists(message_id) OR "
+                                    "message_id = :message_id OR "
+                                    "NOT (#status IN "
+                                    "(:progress, :queued, :running))))"),
+            "ExpressionAttributeNames": {
+                "#status": "status",
+            },
+            "ExpressionAttributeValues": {
+                ":message_id": {
+                    "S": "0",
+                },
+                ":now": {
+                    "S": ANY,
+                },
+                ":one": {
+                    "N": "1",
+                },
+                ":progress": {
+                    "S": "Progress",
+                },
+                ":queued": {
+                    "S": "Queued",
+                },
+                ":running": {
+                    "S": "Running",
+                },
+                ":status": {
+                    "S": "Queued",
+                },
+                ":success": {
+                    "S": "Success",
+                },
+            },
+            "Key": {
+                "id": {
+                    "S": "0",
+                },
+            },
+            "ReturnValues": "UPDATED_NEW",
+            "TableName": "jobs",
+            "UpdateExpression": ("SET #status = :status, "
+                                 "message_id = :message_id, "
+                                 "queued_at = :now, "
+                                 "updated_at = :now "
+                                 "ADD version :one"),
+        },
+        service_response={
+            "Attributes": {
+                "version": {
+                    "N": "3",
+                },
+            },
+        },
+    )
+
+    with dynamodb_stub:
+        version = run(result_writer.claim("0", "0", queued=True))
+
+    dynamodb_stub.assert_no_pending_responses()
+    assert version == 3  # nosec
+
+
+def test_result_writer_skips_cancelled_writes(
+    dynamodb: BaseClient,
+    items: list,
+    result_writer: ResultWriter,
+) -> None:
+    dynamodb_stub = Stubber(dynamodb)
+
+    dynamodb_stub.add_response(
+        "batch_write_item",
+        expected_params={
+            "RequestItems": {
+                "jobs": put_requests(items[:2]),
+            },
+        },
+        service_response=dict(),
+    )
+
+    async def write() -> None:
+        result_writer.start()
+
+        cancelled = create_task(result_writer.write(items[0]))
+        written = create_task(result_writer.write(items[1]))
+
+        await sleep(0)
+
+        cancelled.cancel()
+
+        await result_writer.stop()
+        await written
+
+    with dynamodb_stub:
+        run(write())
+
+    dynamodb_stub.assert_no_pending_responses()
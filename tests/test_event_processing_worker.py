@@ -0,0 +1,737 @@
+from asyncio import (
+    Queue,
+    run,
+    sleep,
+)
+from aws_lambda_powertools import (
+    Logger,
+)
+from botocore.client import (
+    BaseClient,
+)
+from botocore.stub import (
+    ANY,
+    Stubber,
+)
+from event_processing.acknowledgement.main import (
+    AckCoalescer,
+)
+from event_processing.caching.main import (
+    ResultCache,
+)
+from event_processing.handlers.main import (
+    HandlerRegistry,
+    JobExecutor,
+    JobHandler,
+)
+from event_processing.heartbeat.main import (
+    VisibilityHeartbeat,
+)
+from event_processing.metrics.main import (
+    MetricsPublisher,
+)
+from event_processing.results.main import (
+    ResultWriter,
+)
+from event_processing.worker.main import (
+    Worker,
+)
+from json import (
+    dumps,
+)
+from os import (
+    _exit,
+)
+from pydantic import (
+    BaseModel,
+)
+from pytest import (
+    fixture,
+)
+from threading import (
+    Barrier,
+    Event,
+)
+from time import (
+    monotonic,
+    sleep as wait,
+)
+from typing import (
+    Callable,
+    Optional,
+)
+from tests.fixtures import (
+    dynamodb,
+    logger,
+    metrics,
+    sqs_client,
+)
+
+
+class Parameters(BaseModel):
+    seconds: int
+
+
+def build_worker(
+    dynamodb: BaseClient,
+    event_processing: Callable[[dict], dict],
+    logger: Logger,
+    max_in_flight_jobs: int,
+    messages: list,
+    metrics: MetricsPublisher,
+    sqs_client: BaseClient,
+    deduplicate: bool = False,
+    drain_delay: float = 0,
+    drain_timeout: Optional[float] = None,
+    processes: int = 0,
+    result_cache: Optional[ResultCache] = None,
+    timeout: Optional[float] = None,
+) -> Worker:
+    worker = Worker(
+        ack_coalescer=AckCoalescer(
+            logger=logger,
+            max_delay=60,
+            sqs_client=sqs_client,
+        ),
+        deduplicate=deduplicate,
+        drain_timeout=drain_timeout,
+        handlers=HandlerRegistry(
+            default_type="sleep",
+            handlers=[
+                JobHandler(
+                    cacheable=True,
+                    executor=(JobExecutor.PROCESS if processes > 0
+                              else JobExecutor.THREAD),
+                    handler=event_processing,
+                    model=Parameters,
+                    timeout=timeout,
+                    type="sleep",
+                ),
+            ],
+        ),
+        heartbeat=VisibilityHeartbeat(
+            interval=60,
+            logger=logger,
+            metrics=metrics,
+            sqs_client=sqs_client,
+        ),
+        logger=logger,
+        max_in_flight_jobs=max_in_flight_jobs,
+        metrics=metrics,
+        processes=processes,
+        receiver=QueueReceiver(messages, drain_delay),
+        result_cache=result_cache,
+        result_writer=ResultWriter(
+            dynamodb=dynamodb,
+            logger=logger,
+            max_delay=0.1,
+            table_name="jobs",
+        ),
+    )
+
+    return worker
+
+
+def crashing_event_processing(event: dict) -> dict:
+    if event["MessageAttributes"]["id"]["StringValue"] == "0":
+        _exit(1)
+
+    return item(event)
+
+
+def sleeping_event_processing(event: dict) -> dict:
+    wait(event["Body"]["seconds"])
+
+    return item(event)
+
+
+def delete_message_batch_response(ids: range) -> dict:
+    return {
+        "Failed": [],
+        "Successful": [
+            {
+                "Id": str(id),
+            }
+            for id in ids
+        ],
+    }
+
+
+def item(event: dict) -> dict:
+    return {
+        "id": {
+            "S": event["MessageAttributes"]["id"]["StringValue"],
+        },
+    }
+
+
+class QueueReceiver:
+    def __init__(self, messages: list, drain_delay: float = 0) -> None:
+        self.__buffer: Optional[Queue] = None
+        self.__drain_delay = drain_delay
+        self.__messages = messages
+
+    async def get(self) -> Optional[tuple]:
+        return await self.__buffer.get()
+
+    async def drain(self) -> list:
+        await sleep(self.__drain_delay)
+
+        items = list()
+
+        while not self.__buffer.empty():
+            item = self.__buffer.get_nowait()
+
+            if item is not None:
+                items.append(item)
+
+        return items
+
+    def start(self) -> None:
+        self.__buffer = Queue()
+
+        for message in self.__messages:
+            self.__buffer.put_nowait(
+                None if message is None else ("queue", message))
+
+    def stop(self) -> None:
+        self.__buffer.put_nowait(None)
+
+
+@fixture
+def messages() -> list:
+    messages = [
+        {
+            "Body": dumps({
+                "seconds": 1,
+            }),
+            "MessageAttributes": {
+                "id": {
+                    "DataType": "String",
+                    "StringValue": str(id),
+                },
+            },
+            "MessageId": str(id),
+            "ReceiptHandle": str(id),
+        }
+        for id in range(3)
+    ]
+
+    yield messages
+
+
+@fixture
+def dynamodb_stub(dynamodb: BaseClient) -> Stubber:
+    dynamodb_stub = Stubber(dynamodb)
+
+    dynamodb_stub.add_response(
+        "batch_write_item",
+        expected_params=None,
+        service_response=dict(),
+    )
+
+    yield dynamodb_stub
+
+
+def change_message_visibility_batch_params(receipt_handles: list) -> dict:
+    return {
+        "Entries": [
+            {
+                "Id": str(index),
+                "ReceiptHandle": receipt_handle,
+                "VisibilityTimeout": 0,
+            }
+            for index, receipt_handle in enumerate(receipt_handles)
+        ],
+        "QueueUrl": "queue",
+    }
+
+
+def test_worker_skips_succeeded_jobs(
+    dynamodb: BaseClient,
+    logger: Logger,
+    messages: list,
+    metrics: MetricsPublisher,
+    sqs_client: BaseClient,
+) -> None:
+    dynamodb_stub = Stubber(dynamodb)
+    processed = list()
+    sqs_stub = Stubber(sqs_client)
+
+    def event_processing(event: dict) -> dict:
+        processed.append(event["MessageAttributes"]["id"]["StringValue"])
+
+        return item(event)
+
+    worker = build_worker(
+        deduplicate=True,
+        dynamodb=dynamodb,
+        event_processing=event_processing,
+        logger=logger,
+        max_in_flight_jobs=1,
+        messages=messages[:2] + [None],
+        metrics=metrics,
+        sqs_client=sqs_client,
+    )
+
+    dynamodb_stub.add_client_error(
+        "update_item",
+        expected_params={
+            "ConditionExpression": ("attribute_not_exists(id) OR "
+                                    "(#status <> :success AND "
+                                    "(attribute_not_exists(message_id) OR "
+                                    "message_id = :message_id OR "
+                                    "NOT (#status IN "
+                                    "(:progress, :queued, :running))))"),
+            "ExpressionAttributeNames": {
+                "#status": "status",
+            },
+            "ExpressionAttributeValues": {
+                ":message_id": {
+                    "S": "0",
+                },
+                ":now": {
+                    "S": ANY,
+                },
+                ":one": {
+                    "N": "1",
+                },
+                ":progress": {
+                    "S": "Progress",
+                },
+                ":queued": {
+                    "S": "Queued",
+                },
+                ":running": {
+                    "S": "Running",
+                },
+                ":status": {
+                    "S": "Running",
+                },
+                ":success": {
+                    "S": "Success",
+                },
+            },
+            "Key": {
+                "id": {
+                    "S": "0",
+                },
+            },
+            "ReturnValues": "UPDATED_NEW",
+            "TableName": "jobs",
+            "UpdateExpression": ("SET #status = :status, "
+                                 "message_id = :message_id, "
+                                 "started_at = :now, "
+                                 "updated_at = :now "
+                                 "ADD version :one"),
+        },
+        service_error_code="ConditionalCheckFailedException",
+    )
+    dynamodb_stub.add_response(
+        "update_item",
+        expected_params=None,
+        service_response={
+            "Attributes": {
+                "version": {
+                    "N": "1",
+                },
+            },
+        },
+    )
+
+    dynamodb_stub.add_response(
+        "update_item",
+        expected_params=None,
+        service_response=dict(),
+    )
+
+    sqs_stub.add_response(
+        "delete_message_batch",
+        expected_params=None,
+        service_response=delete_message_batch_response(range(2)),
+    )
+
+    with dynamodb_stub, sqs_stub:
+        run(worker.start())
+
+    dynamodb_stub.assert_no_pending_responses()
+    sqs_stub.assert_no_pending_responses()
+    assert processed == ["1"]  # nosec
+
+
+def test_worker_caches_results_across_callbacks(
+    dynamodb: BaseClient,
+    logger: Logger,
+    messages: list,
+    metrics: MetricsPublisher,
+    sqs_client: BaseClient,
+) -> None:
+    dynamodb_stub = Stubber(dynamodb)
+    processed = list()
+    sqs_stub = Stubber(sqs_client)
+
+    def event_processing(event: dict) -> dict:
+        processed.append(event["MessageAttributes"]["id"]["StringValue"])
+
+        return item(event)
+
+    for index, message in enumerate(messages[:2]):
+        message["Body"] = dumps({
+            "callback_url": f"https://example.com/{index}",
+            "seconds": 1,
+        })
+
+    worker = build_worker(
+        dynamodb=dynamodb,
+        event_processing=event_processing,
+        logger=logger,
+        max_in_flight_jobs=1,
+        messages=messages[:2] + [None],
+        metrics=metrics,
+        result_cache=ResultCache(
+            dynamodb=dynamodb,
+            logger=logger,
+            metrics=metrics,
+        ),
+        sqs_client=sqs_client,
+    )
+
+    for _ in range(2):
+        dynamodb_stub.add_response(
+            "batch_write_item",
+            expected_params=None,
+            service_response=dict(),
+        )
+
+    sqs_stub.add_response(
+        "delete_message_batch",
+        expected_params=None,
+        service_response=delete_message_batch_response(range(2)),
+    )
+
+    with dynamodb_stub, sqs_stub:
+        run(worker.start())
+
+    dynamodb_stub.assert_no_pending_responses()
+    sqs_stub.assert_no_pending_responses()
+    assert processed == ["0"]  # nosec
+
+
+def test_worker_releases_failed_messages(
+    dynamodb: BaseClient,
+    dynamodb_stub: Stubber,
+    logger: Logger,
+    messages: list,
+    metrics: MetricsPublisher,
+    sqs_client: BaseClient,
+) -> None:
+    barrier = Barrier(len(messages), timeout=5)
+    sqs_stub = Stubber(sqs_client)
+
+    def event_processing(event: dict) -> dict:
+        barrier.wait()
+        worker.stop()
+
+        if event["MessageAttributes"]["id"]["StringValue"] == "1":
+            raise ValueError("1 major then 0")
+
+        return item(event)
+
+    worker = build_worker(
+        dynamodb=dynamodb,
+        event_processing=event_processing,
+        logger=logger,
+        max_in_flight_jobs=len(messages),
+        messages=messages,
+        metrics=metrics,
+        sqs_client=sqs_client,
+    )
+
+    sqs_stub.add_response(
+        "change_message_visibility_batch",
+        expected_params=change_message_visibility_batch_params(["1"]),
+        service_response=delete_message_batch_response(range(1)),
+    )
+    sqs_stub.add_response(
+        "delete_message_batch",
+        expected_params=None,
+        service_response=delete_message_batch_response(range(2)),
+    )
+
+    with dynamodb_stub, sqs_stub:
+        run(worker.start())
+
+    dynamodb_stub.assert_no_pending_responses()
+    sqs_stub.assert_no_pending_responses()
+
+
+def test_worker_restarts_crashed_processes(
+    dynamodb: BaseClient,
+    logger: Logger,
+    messages: list,
+    metrics: MetricsPublisher,
+    sqs_client: BaseClient,
+) -> None:
+    dynamodb_stub = Stubber(dynamodb)
+    sqs_stub = Stubber(sqs_client)
+    worker = build_worker(
+        dynamodb=dynamodb,
+        event_processing=crashing_event_processing,
+        logger=logger,
+        max_in_flight_jobs=1,
+        messages=messages + [None],
+        metrics=metrics,
+        processes=1,
+        sqs_client=sqs_client,
+    )
+
+    for _ in messages[1:]:
+        dynamodb_stub.add_response(
+            "batch_write_item",
+            expected_params=None,
+            service_response=dict(),
+        )
+
+    sqs_stub.add_response(
+        "change_message_visibility_batch",
+        expected_params=change_message_visibility_batch_params(["0"]),
+        service_response=delete_message_batch_response(range(1)),
+    )
+    sqs_stub.add_response(
+        "delete_message_batch",
+        expected_params=None,
+        service_response=delete_message_batch_response(range(2)),
+    )
+
+    with dynamodb_stub, sqs_stub:
+        run(worker.start())
+
+    dynamodb_stub.assert_no_pending_responses()
+    sqs_stub.assert_no_pending_responses()
+
+
+def test_worker_queues_jobs_for_busy_processes(
+    dynamodb: BaseClient,
+    logger: Logger,
+    messages: list,
+    metrics: MetricsPublisher,
+    sqs_client: BaseClient,
+) -> None:
+    dynamodb_stub = Stubber(dynamodb)
+    sqs_stub = Stubber(sqs_client)
+    worker = build_worker(
+        dynamodb=dynamodb,
+        event_processing=sleeping_event_processing,
+        logger=logger,
+        max_in_flight_jobs=len(messages),
+        messages=messages + [None],
+        metrics=metrics,
+        processes=1,
+        sqs_client=sqs_client,
+        timeout=1.8,
+    )
+
+    for _ in messages:
+        dynamodb_stub.add_response(
+            "batch_write_item",
+            expected_params=None,
+            service_response=dict(),
+        )
+
+    sqs_stub.add_response(
+        "delete_message_batch",
+        expected_params=None,
+        service_response=delete_message_batch_response(range(len(messages))),
+    )
+
+    with dynamodb_stub, sqs_stub:
+        run(worker.start())
+
+    dynamodb_stub.assert_no_pending_responses()
+    sqs_stub.assert_no_pending_responses()
+
+
+def test_worker_releases_unfinished_jobs_after_drain_timeout(
+    dynamodb: BaseClient,
+    logger: Logger,
+    messages: list,
+    metrics: MetricsPublisher,
+    sqs_client: BaseClient,
+) -> None:
+    dynamodb_stub = Stubber(dynamodb)
+    finished = Event()
+    sqs_stub = Stubber(sqs_client)
+
+    def event_processing(event: dict) -> dict:
+        worker.stop()
+        finished.wait(5)
+
+        return item(event)
+
+    worker = build_worker(
+        drain_timeout=0.1,
+        dynamodb=dynamodb,
+        event_processing=event_processing,
+        logger=logger,
+        max_in_flight_jobs=1,
+        messages=messages,
+        metrics=metrics,
+        sqs_client=sqs_client,
+    )
+
+    sqs_stub.add_response(
+        "change_message_visibility_batch",
+        expected_params=change_message_visibility_batch_params(["2", "1"]),
+        service_response=delete_message_batch_response(range(2)),
+    )
+    sqs_stub.add_response(
+        "change_message_visibility_batch",
+        expected_params=change_message_visibility_batch_params(["0"]),
+        service_response=delete_message_batch_response(range(1)),
+    )
+
+    with dynamodb_stub, sqs_stub:
+        run(worker.start())
+
+    finished.set()
+    dynamodb_stub.assert_no_pending_responses()
+    sqs_stub.assert_no_pending_responses()
+
+
+def test_worker_drain_timeout_starts_at_stop(
+    dynamodb: BaseClient,
+    logger: Logger,
+    messages: list,
+    metrics: MetricsPublisher,
+    sqs_client: BaseClient,
+) -> None:
+    dynamodb_stub = Stubber(dynamodb)
+    finished = Event()
+    sqs_stub = Stubber(sqs_client)
+    stopped_at = list()
+
+    def event_processing(event: dict) -> dict:
+        stopped_at.append(monotonic())
+        worker.stop()
+        finished.wait(5)
+
+        return item(event)
+
+    worker = build_worker(
+        drain_delay=0.5,
+        drain_timeout=0.5,
+        dynamodb=dynamodb,
+        event_processing=event_processing,
+        logger=logger,
+        max_in_flight_jobs=1,
+        messages=messages[:1],
+        metrics=metrics,
+        sqs_client=sqs_client,
+    )
+
+    sqs_stub.add_response(
+        "change_message_visibility_batch",
+        expected_params=change_message_visibility_batch_params(["0"]),
+        service_response=delete_message_batch_response(range(1)),
+    )
+
+    with dynamodb_stub, sqs_stub:
+        run(worker.start())
+
+    finished.set()
+    sqs_stub.assert_no_pending_responses()
+    assert monotonic() - stopped_at[0] < 0.9  # nosec
+
+
+def test_worker_releases_unstarted_messages_on_shutdown(
+    dynamodb: BaseClient,
+    dynamodb_stub: Stubber,
+    logger: Logger,
+    messages: list,
+    metrics: MetricsPublisher,
+    sqs_client: BaseClient,
+) -> None:
+    sqs_stub = Stubber(sqs_client)
+
+    def event_processing(event: dict) -> dict:
+        worker.stop()
+
+        return item(event)
+
+    worker = build_worker(
+        dynamodb=dynamodb,
+        event_processing=event_processing,
+        logger=logger,
+        max_in_flight_jobs=1,
+        messages=messages,
+        metrics=metrics,
+        sqs_client=sqs_client,
+    )
+
+    sqs_stub.add_response(
+        "change_message_visibility_batch",
+        expected_params=change_message_visibility_batch_params(["2", "1"]),
+        service_response=delete_message_batch_response(range(2)),
+    )
+    sqs_stub.add_response(
+        "delete_message_batch",
+        expected_params={
+            "Entries": [
+                {
+                    "Id": "0",
+                    "ReceiptHandle": "0",
+                },
+            ],
+            "QueueUrl": "queue",
+        },
+        service_response=delete_message_batch_response(range(1)),
+    )
+
+    with dynamodb_stub, sqs_stub:
+        run(worker.start())
+
+    dynamodb_stub.assert_no_pending_responses()
+    sqs_stub.assert_no_pending_responses()
+
+
+def test_worker_runs_jobs_concurrently(
+    dynamodb: BaseClient,
+    dynamodb_stub: Stubber,
+    logger: Logger,
+    messages: list,
+    metrics: MetricsPublisher,
+    sqs_client: BaseClient,
+) -> None:
+    barrier = Barrier(len(messages), timeout=5)
+    processed = list()
+    sqs_stub = Stubber(sqs_client)
+
+    def event_processing(event: dict) -> dict:
+        barrier.wait()
+        processed.append(event["MessageAttributes"]["id"]["StringValue"])
+        worker.stop()
+
+        return item(event)
+
+    worker = build_worker(
+        dynamodb=dynamodb,
+        event_processing=event_processing,
+        logger=logger,
+        max_in_flight_jobs=len(messages),
+        messages=messages,
+        metrics=metrics,
+        sqs_client=sqs_client,
+    )
+
+    sqs_stub.add_response(
+        "delete_message_batch",
+        expected_params=None,
+        service_response=delete_message_batch_response(range(len(messages))),
+    )
+
+    with dynamodb_stub, sqs_stub:
+        run(worker.start())
+
+    dynamodb_stub.assert_no_pending_responses()
+    sqs_stub.assert_no_pending_responses()
+    assert sorted(processed) == ["0", "1", "2"]  # nosec
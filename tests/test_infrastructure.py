@@ -10,6 +10,7 @@ from aws_cdk.assertions import (
 )
 from pytest import (
     fixture,
+    raises,
 )
 
 
@@ -49,6 +50,35 @@ def test_jobs_api_is_setup(template: Template) -> None:
             "PathPart": "jobs",
         },
     })
+    template.has_resource("AWS::ApiGateway::Resource", {
+        "Properties": {
+            "PathPart": "jobs:batch",
+        },
+    })
+    template.has_resource("AWS::ApiGateway::Model", {
+        "Properties": {
+            "Name": "JobsBatchRequest",
+            "Schema": Match.object_like({
+                "maxItems": 10,
+                "type": "array",
+            }),
+        },
+    })
+    template.has_resource("AWS::ApiGateway::Model", {
+        "Properties": {
+            "Name": "JobsRequest",
+            "Schema": Match.object_like({
+                "properties": Match.object_like({
+                    "type": {
+                        "enum": [
+                            "sleep",
+                        ],
+                        "type": "string",
+                    },
+                }),
+            }),
+        },
+    })
     template.has_resource("AWS::ApiGateway::Stage", {
         "Properties": {
             "StageName": "dev",
@@ -144,18 +174,447 @@ def test_jobs_service_is_setup(template: Template) -> None:
             "RetentionDays": 0,
         },
     })
+    template.has_resource("AWS::Lambda::LayerVersion", {
+        "Properties": {
+            "Description": "Event Processing core and results writer",
+        },
+    })
     template.has_resource("AWS::Lambda::Function", {
         "Properties": {
             "Timeout": 300,
         },
     })
+    template.has_resource("AWS::ECS::TaskDefinition", {
+        "Properties": {
+            "ContainerDefinitions": [
+                Match.object_like({
+                    "Environment": Match.array_with([
+                        {
+                            "Name": "MAX_IN_FLIGHT_JOBS",
+                            "Value": "10",
+                        },
+                        Match.object_like({
+                            "Name": "QUEUE_URL",
+                        }),
+                        {
+                            "Name": "WORKER_PROCESSES",
+                            "Value": "0",
+                        },
+                    ]),
+                    "StopTimeout": 120,
+                }),
+            ],
+            "Cpu": "256",
+            "Memory": "1024",
+        },
+    })
     template.resource_count_is("AWS::ECS::Service", 1)
     template.resource_count_is("AWS::ECS::TaskDefinition", 1)
-    template.resource_count_is("AWS::Events::EventBus", 1)
+    template.resource_count_is("AWS::Events::EventBus", 2)
+    template.has_resource("AWS::Lambda::EventSourceMapping", {
+        "Properties": {
+            "BatchSize": 100,
+            "FunctionResponseTypes": [
+                "ReportBatchItemFailures",
+            ],
+            "MaximumBatchingWindowInSeconds": 30,
+            "ScalingConfig": {
+                "MaximumConcurrency": 2,
+            },
+        },
+    })
     template.resource_count_is("AWS::Lambda::EventInvokeConfig", 1)
+    template.has_resource("AWS::SQS::Queue", {
+        "Properties": {
+            "QueueName": "jobs_queue",
+            "RedrivePolicy": Match.object_like({
+                "maxReceiveCount": 2,
+            }),
+        },
+    })
     template.resource_count_is("AWS::SQS::Queue", 2)
 
 
+def test_jobs_queue_is_fifo() -> None:
+    app = App()
+    stack = InfrastructureStack(
+        app,
+        "AsynchronousEventProcessingAPIGatewaySQS",
+        fifo=True,
+    )
+    template = Template.from_stack(stack)
+
+    template.has_resource("AWS::ApiGateway::Method", {
+        "Properties": {
+            "HttpMethod": "POST",
+            "Integration": Match.object_like({
+                "RequestTemplates": {
+                    "application/json": {
+                        "Fn::Join": [
+                            "",
+                            Match.array_with([
+                                Match.string_like_regexp(
+                                    "MessageDeduplicationId"),
+                            ]),
+                        ],
+                    },
+                },
+            }),
+            "RequestParameters": {
+                "method.request.header.Idempotency-Key": False,
+            },
+        },
+    })
+    template.has_resource("AWS::Lambda::EventSourceMapping", {
+        "Properties": {
+            "BatchSize": 10,
+            "MaximumBatchingWindowInSeconds": Match.absent(),
+        },
+    })
+    template.has_resource("AWS::SQS::Queue", {
+        "Properties": {
+            "FifoQueue": True,
+            "QueueName": "jobs_queue.fifo",
+        },
+    })
+
+
+def test_job_status_cache_is_setup() -> None:
+    app = App()
+    stack = InfrastructureStack(
+        app,
+        "AsynchronousEventProcessingAPIGatewaySQS",
+        cache_ttl=300,
+    )
+    template = Template.from_stack(stack)
+
+    template.has_resource("AWS::ApiGateway::Method", {
+        "Properties": {
+            "HttpMethod": "GET",
+            "Integration": Match.object_like({
+                "CacheKeyParameters": [
+                    "method.request.path.jobId",
+                    "method.request.querystring.wait",
+                ],
+            }),
+        },
+    })
+    template.has_resource("AWS::ApiGateway::Stage", {
+        "Properties": {
+            "CacheClusterEnabled": True,
+            "MethodSettings": Match.array_with([
+                Match.object_like({
+                    "CacheTtlInSeconds": 300,
+                    "CachingEnabled": True,
+                    "HttpMethod": "GET",
+                }),
+            ]),
+        },
+    })
+
+
+def test_scale_to_zero_is_setup() -> None:
+    app = App()
+    stack = InfrastructureStack(
+        app,
+        "AsynchronousEventProcessingAPIGatewaySQS",
+        scale_to_zero=True,
+    )
+    template = Template.from_stack(stack)
+
+    template.has_resource("AWS::ApplicationAutoScaling::ScalableTarget", {
+        "Properties": {
+            "MinCapacity": 0,
+        },
+    })
+    template.has_resource("AWS::ApplicationAutoScaling::ScalingPolicy", {
+        "Properties": {
+            "PolicyType": "StepScaling",
+            "StepScalingPolicyConfiguration": Match.object_like({
+                "AdjustmentType": "ChangeInCapacity",
+                "StepAdjustments": [
+                    {
+                        "MetricIntervalLowerBound": 0,
+                        "ScalingAdjustment": 1,
+                    },
+                ],
+            }),
+        },
+    })
+    template.has_resource("AWS::CloudWatch::Alarm", {
+        "Properties": {
+            "EvaluationPeriods": 1,
+            "Metrics": Match.array_with([
+                Match.object_like({
+                    "Expression": ("IF((visible_0) > 0 AND "
+                                   "FILL(tasks, 0) == 0, 1, 0)"),
+                }),
+            ]),
+            "Threshold": 1,
+        },
+    })
+
+
+def test_short_jobs_are_routed() -> None:
+    app = App()
+    stack = InfrastructureStack(
+        app,
+        "AsynchronousEventProcessingAPIGatewaySQS",
+        job_durations={
+            "sleep": 5,
+        },
+        short_job_threshold=10,
+    )
+    template = Template.from_stack(stack)
+
+    template.has_resource("AWS::ApiGateway::Method", {
+        "Properties": {
+            "HttpMethod": "POST",
+            "Integration": Match.object_like({
+                "RequestTemplates": {
+                    "application/json": {
+                        "Fn::Join": [
+                            "",
+                            Match.array_with([
+                                Match.string_like_regexp(
+                                    ("\"\\$!job.type\" != \"sleep\""
+                                     "\\)#set\\(\\$short = false\\)")),
+                            ]),
+                        ],
+                    },
+                },
+            }),
+        },
+    })
+    template.has_resource("AWS::ApiGateway::Method", {
+        "Properties": {
+            "HttpMethod": "POST",
+            "Integration": Match.object_like({
+                "RequestTemplates": {
+                    "application/json": {
+                        "Fn::Join": [
+                            "",
+                            Match.array_with([
+                                Match.string_like_regexp(
+                                    "\\$seconds > 10"),
+                            ]),
+                        ],
+                    },
+                },
+            }),
+        },
+    })
+    template.has_resource("AWS::Lambda::EventSourceMapping", {
+        "Properties": {
+            "BatchSize": 10,
+            "FunctionResponseTypes": [
+                "ReportBatchItemFailures",
+            ],
+        },
+    })
+    template.has_resource("AWS::Lambda::Function", {
+        "Properties": {
+            "Environment": {
+                "Variables": Match.object_like({
+                    "TIMEOUT": "10",
+                }),
+            },
+            "Timeout": 130,
+        },
+    })
+    template.has_resource("AWS::SQS::Queue", {
+        "Properties": {
+            "QueueName": "short_jobs_queue",
+            "VisibilityTimeout": 130,
+        },
+    })
+
+
+def test_priority_lanes_are_setup() -> None:
+    app = App()
+    stack = InfrastructureStack(
+        app,
+        "AsynchronousEventProcessingAPIGatewaySQS",
+        priorities={
+            "high": 4,
+            "low": 1,
+            "normal": 2,
+        },
+    )
+    template = Template.from_stack(stack)
+
+    template.has_resource("AWS::ApiGateway::Model", {
+        "Properties": {
+            "Name": "JobsRequest",
+            "Schema": Match.object_like({
+                "properties": Match.object_like({
+                    "priority": {
+                        "enum": [
+                            "high",
+                            "low",
+                            "normal",
+                        ],
+                        "type": "string",
+                    },
+                }),
+            }),
+        },
+    })
+    template.has_resource("AWS::ApplicationAutoScaling::ScalingPolicy", {
+        "Properties": {
+            "TargetTrackingScalingPolicyConfiguration": Match.object_like({
+                "CustomizedMetricSpecification": {
+                    "Metrics": Match.array_with([
+                        Match.object_like({
+                            "Expression": Match.string_like_regexp(
+                                ("^\\(1.0 \\* visible_0 \\+ "
+                                 "2.0 \\* visible_1 \\+ "
+                                 "0.5 \\* visible_2\\) / ")),
+                        }),
+                    ]),
+                },
+            }),
+        },
+    })
+    template.has_resource("AWS::ECS::TaskDefinition", {
+        "Properties": {
+            "ContainerDefinitions": [
+                Match.object_like({
+                    "Environment": Match.array_with([
+                        {
+                            "Name": "QUEUE_WEIGHT",
+                            "Value": "2",
+                        },
+                    ]),
+                }),
+            ],
+        },
+    })
+
+    for queue_name in ["jobs_queue_high", "jobs_queue_low"]:
+        template.has_resource("AWS::SQS::Queue", {
+            "Properties": {
+                "QueueName": queue_name,
+            },
+        })
+
+
+def test_result_cache_is_setup() -> None:
+    app = App()
+    stack = InfrastructureStack(
+        app,
+        "AsynchronousEventProcessingAPIGatewaySQS",
+        result_cache=True,
+    )
+    template = Template.from_stack(stack)
+
+    template.has_resource("AWS::DynamoDB::Table", {
+        "Properties": Match.object_like({
+            "TimeToLiveSpecification": {
+                "AttributeName": "expires_at",
+                "Enabled": True,
+            },
+        }),
+    })
+    template.has_resource("AWS::ECS::TaskDefinition", {
+        "Properties": {
+            "ContainerDefinitions": [
+                Match.object_like({
+                    "Environment": Match.array_with([
+                        {
+                            "Name": "RESULT_CACHE_SIZE",
+                            "Value": "1024",
+                        },
+                    ]),
+                }),
+            ],
+        },
+    })
+    template.resource_count_is("AWS::DynamoDB::Table", 2)
+
+
+def test_backlog_scaling_is_setup(template: Template) -> None:
+    template.has_resource("AWS::ApplicationAutoScaling::ScalingPolicy", {
+        "Properties": {
+            "PolicyType": "TargetTrackingScaling",
+            "TargetTrackingScalingPolicyConfiguration": {
+                "CustomizedMetricSpecification": {
+                    "Metrics": Match.array_with([
+                        Match.object_like({
+                            "Expression": Match.string_like_regexp(
+                                "^\\(1.0 \\* visible_0\\) / "),
+                            "Id": "backlog",
+                            "ReturnData": True,
+                        }),
+                    ]),
+                },
+                "ScaleInCooldown": 300,
+                "ScaleOutCooldown": 60,
+                "TargetValue": 60,
+            },
+        },
+    })
+    template.resource_properties_count_is(
+        "AWS::ApplicationAutoScaling::ScalingPolicy",
+        {
+            "PolicyType": "StepScaling",
+        },
+        0,
+    )
+
+
+def test_job_status_is_setup(template: Template) -> None:
+    template.has_resource("AWS::ApiGateway::Method", {
+        "Properties": {
+            "HttpMethod": "GET",
+            "Integration": Match.object_like({
+                "Type": "AWS_PROXY",
+            }),
+            "RequestParameters": {
+                "method.request.path.jobId": True,
+                "method.request.querystring.wait": False,
+            },
+        },
+    })
+    template.has_resource("AWS::Lambda::Function", {
+        "Properties": {
+            "Environment": {
+                "Variables": Match.object_like({
+                    "MAX_WAIT": "20",
+                }),
+            },
+            "Timeout": 25,
+        },
+    })
+
+
+def test_notifications_are_setup(template: Template) -> None:
+    template.has_resource("AWS::DynamoDB::Table", {
+        "Properties": {
+            "StreamSpecification": {
+                "StreamViewType": "NEW_AND_OLD_IMAGES",
+            },
+        },
+    })
+    template.has_resource("AWS::Lambda::EventSourceMapping", {
+        "Properties": {
+            "BisectBatchOnFunctionError": True,
+            "FilterCriteria": {
+                "Filters": [
+                    {
+                        "Pattern": Match.string_like_regexp("Success"),
+                    },
+                ],
+            },
+            "FunctionResponseTypes": [
+                "ReportBatchItemFailures",
+            ],
+            "MaximumRetryAttempts": 2,
+            "StartingPosition": "LATEST",
+        },
+    })
+
+
 def test_jobs_table_is_setup(template: Template) -> None:
     template.has_resource("AWS::DynamoDB::Table", {
         "DeletionPolicy": "Delete",
@@ -173,3 +632,59 @@ def test_jobs_table_is_setup(template: Template) -> None:
         },
         "UpdateReplacePolicy": "Delete",
     })
+
+
+def test_tenants_are_throttled() -> None:
+    app = App()
+    stack = InfrastructureStack(
+        app,
+        "AsynchronousEventProcessingAPIGatewaySQS",
+        tenant_burst_limit=4,
+        tenant_rate_limit=2,
+        tenants=("acme", "globex"),
+    )
+    template = Template.from_stack(stack)
+
+    template.resource_count_is("AWS::ApiGateway::ApiKey", 2)
+    template.resource_count_is("AWS::ApiGateway::UsagePlanKey", 2)
+    template.has_resource("AWS::ApiGateway::Method", {
+        "Properties": Match.object_like({
+            "ApiKeyRequired": True,
+            "HttpMethod": "POST",
+            "Integration": Match.object_like({
+                "RequestTemplates": {
+                    "application/json": {
+                        "Fn::Join": [
+                            "",
+                            Match.array_with([
+                                Match.string_like_regexp(
+                                    "\"tenant\": \\{"),
+                            ]),
+                        ],
+                    },
+                },
+            }),
+        }),
+    })
+    template.has_resource("AWS::ApiGateway::UsagePlan", {
+        "Properties": Match.object_like({
+            "Throttle": {
+                "BurstLimit": 4,
+                "RateLimit": 2,
+            },
+        }),
+    })
+    template.has_output("JobsAPIKeyacme", Match.any_value())
+
+
+def test_drain_fits_in_stop_timeout() -> None:
+    app = App()
+
+    with raises(ValueError):
+        InfrastructureStack(
+            app,
+            "AsynchronousEventProcessingAPIGatewaySQS",
+            drain_timeout=100,
+            receive_wait_time=20,
+            stop_timeout=120,
+        )
@@ -0,0 +1,150 @@
+from aws_lambda_powertools.utilities.typing import (
+    LambdaContext,
+)
+from botocore.stub import (
+    Stubber,
+)
+from job_status.main import (
+    dynamodb,
+    handler,
+)
+from json import (
+    dumps,
+    loads,
+)
+from tests.fixtures import (
+    context,
+)
+
+
+def event(wait: str = None, etag: str = None) -> dict:
+    return {
+        "headers": None if etag is None else {
+            "if-none-match": etag,
+        },
+        "pathParameters": {
+            "jobId": "1",
+        },
+        "queryStringParameters": None if wait is None else {
+            "wait": wait,
+        },
+    }
+
+
+def get_item_response(status: str = None) -> dict:
+    if status is None:
+        return dict()
+
+    return {
+        "Item": {
+            "id": {
+                "S": "1",
+            },
+            "parameters": {
+                "S": dumps({
+                    "seconds": 1,
+                }),
+            },
+            "status": {
+                "S": status,
+            },
+            "updated_at": {
+                "S": "2023-01-01T00:00:00+00:00",
+            },
+        },
+    }
+
+
+def test_job_status(context: LambdaContext) -> None:
+    dynamodb_stub = Stubber(dynamodb)
+
+    dynamodb_stub.add_response(
+        "get_item",
+        expected_params={
+            "ConsistentRead": True,
+            "Key": {
+                "id": {
+                    "S": "1",
+                },
+            },
+            "TableName": "jobs",
+        },
+        service_response=get_item_response("Running"),
+    )
+
+    with dynamodb_stub:
+        response = handler(event(), context)
+
+    dynamodb_stub.assert_no_pending_responses()
+    assert response["statusCode"] == 200  # nosec
+    assert loads(response["body"]) == {  # nosec
+        "parameters": {
+            "seconds": 1,
+        },
+        "status": "Running",
+        "updated_at": "2023-01-01T00:00:00+00:00",
+    }
+    assert response["headers"]["Cache-Control"] == "no-cache"  # nosec
+
+
+def test_job_status_waits_for_completion(context: LambdaContext) -> None:
+    dynamodb_stub = Stubber(dynamodb)
+
+    for status in [None, "Running", "Success"]:
+        dynamodb_stub.add_response(
+            "get_item",
+            expected_params=None,
+            service_response=get_item_response(status),
+        )
+
+    with dynamodb_stub:
+        response = handler(event("5"), context)
+
+    dynamodb_stub.assert_no_pending_responses()
+    assert response["statusCode"] == 200  # nosec
+    assert loads(response["body"])["status"] == "Success"  # nosec
+
+
+def test_job_status_is_cacheable_when_completed(
+    context: LambdaContext,
+) -> None:
+    dynamodb_stub = Stubber(dynamodb)
+
+    for _ in range(2):
+        dynamodb_stub.add_response(
+            "get_item",
+            expected_params=None,
+            service_response=get_item_response("Success"),
+        )
+
+    with dynamodb_stub:
+        response = handler(event(), context)
+        etag = response["headers"]["ETag"]
+        not_modified_response = handler(event(etag=etag), context)
+
+    assert response["headers"]["Cache-Control"] == \
+        "private, max-age=31536000, immutable"  # nosec
+    assert not_modified_response["body"] == ""  # nosec
+    assert not_modified_response["headers"]["ETag"] == etag  # nosec
+    assert not_modified_response["statusCode"] == 304  # nosec
+
+
+def test_job_status_rejects_invalid_wait(context: LambdaContext) -> None:
+    response = handler(event("soon"), context)
+
+    assert response["statusCode"] == 400  # nosec
+
+
+def test_job_status_not_found(context: LambdaContext) -> None:
+    dynamodb_stub = Stubber(dynamodb)
+
+    dynamodb_stub.add_response(
+        "get_item",
+        expected_params=None,
+        service_response=get_item_response(),
+    )
+
+    with dynamodb_stub:
+        response = handler(event("0"), context)
+
+    assert response["statusCode"] == 404  # nosec
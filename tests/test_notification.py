@@ -0,0 +1,173 @@
+from aws_lambda_powertools.utilities.typing import (
+    LambdaContext,
+)
+from botocore.stub import (
+    Stubber,
+)
+from http.server import (
+    BaseHTTPRequestHandler,
+    HTTPServer,
+)
+from json import (
+    dumps,
+    loads,
+)
+from notification.main import (
+    events,
+    handler,
+)
+from pytest import (
+    fixture,
+)
+from tests.fixtures import (
+    context,
+)
+from threading import (
+    Thread,
+)
+
+
+def record(
+    sequence_number: str,
+    new_image: dict,
+    old_image: dict = dict(),
+) -> dict:
+    return {
+        "dynamodb": {
+            "NewImage": new_image,
+            "OldImage": old_image,
+            "SequenceNumber": sequence_number,
+        },
+        "eventName": "MODIFY",
+    }
+
+
+@fixture
+def callbacks() -> list:
+    callbacks = list()
+
+    class CallbackHandler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:
+            length = int(self.headers["Content-Length"])
+
+            callbacks.append(loads(self.rfile.read(length)))
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), CallbackHandler)
+    thread = Thread(target=server.serve_forever, daemon=True)
+
+    thread.start()
+
+    callbacks.append(f"http://127.0.0.1:{server.server_port}/callback")
+
+    yield callbacks
+
+    server.shutdown()
+
+
+def test_notification(
+    callbacks: list,
+    context: LambdaContext,
+) -> None:
+    callback_url = callbacks.pop()
+    context.get_remaining_time_in_millis = lambda: 60000
+    event = {
+        "Records": [
+            record(
+                "1",
+                {
+                    "callback_url": {
+                        "S": callback_url,
+                    },
+                    "id": {
+                        "S": "1",
+                    },
+                    "status": {
+                        "S": "Success",
+                    },
+                },
+                {
+                    "id": {
+                        "S": "1",
+                    },
+                    "status": {
+                        "S": "Running",
+                    },
+                },
+            ),
+            record(
+                "2",
+                {
+                    "id": {
+                        "S": "2",
+                    },
+                    "status": {
+                        "S": "Running",
+                    },
+                },
+            ),
+            record(
+                "3",
+                {
+                    "id": {
+                        "S": "3",
+                    },
+                    "status": {
+                        "S": "Failure",
+                    },
+                },
+            ),
+        ],
+    }
+    events_stub = Stubber(events)
+
+    events_stub.add_response(
+        "put_events",
+        expected_params={
+            "Entries": [
+                {
+                    "Detail": dumps({
+                        "id": id,
+                        "status": status,
+                    }),
+                    "DetailType": "Job Completed",
+                    "EventBusName": "jobs",
+                    "Source": "event_processing",
+                }
+                for id, status in [("1", "Success"), ("3", "Failure")]
+            ],
+        },
+        service_response={
+            "Entries": [
+                {
+                    "EventId": "1",
+                },
+                {
+                    "ErrorCode": "InternalFailure",
+                },
+            ],
+            "FailedEntryCount": 1,
+        },
+    )
+
+    with events_stub:
+        response = handler(event, context)
+
+    events_stub.assert_no_pending_responses()
+    assert callbacks == [  # nosec
+        {
+            "id": "1",
+            "status": "Success",
+        },
+    ]
+    assert response == {  # nosec
+        "batchItemFailures": [
+            {
+                "itemIdentifier": "3",
+            },
+        ],
+    }
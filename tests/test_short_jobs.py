@@ -0,0 +1,95 @@
+from aws_lambda_powertools.utilities.typing import (
+    LambdaContext,
+)
+from botocore.stub import (
+    Stubber,
+)
+from json import (
+    dumps,
+)
+from pytest import (
+    fixture,
+)
+from short_jobs.main import (
+    dynamodb,
+    handler,
+)
+from tests.fixtures import (
+    context,
+)
+
+
+@fixture
+def event() -> dict:
+    event = {
+        "Records": [
+            {
+                "body": dumps({
+                    "seconds": seconds,
+                    "type": type,
+                }),
+                "messageAttributes": {
+                    "id": {
+                        "dataType": "String",
+                        "stringValue": str(id),
+                    },
+                },
+                "messageId": str(id),
+                "receiptHandle": str(id),
+            }
+            for id, (seconds, type) in enumerate([
+                (1, "sleep"),
+                (301, "sleep"),
+                (1, "resize"),
+            ])
+        ],
+    }
+
+    yield event
+
+
+def test_short_jobs(context: LambdaContext, event: dict) -> None:
+    dynamodb_stub = Stubber(dynamodb)
+
+    dynamodb_stub.add_response(
+        "batch_write_item",
+        expected_params={
+            "RequestItems": {
+                "jobs": [
+                    {
+                        "PutRequest": {
+                            "Item": {
+                                "id": {
+                                    "S": "0",
+                                },
+                                "results": {
+                                    "S": dumps({
+                                        "message": "I slept for 1 seconds",
+                                    }),
+                                },
+                                "status": {
+                                    "S": "Success",
+                                },
+                            },
+                        },
+                    },
+                ],
+            },
+        },
+        service_response=dict(),
+    )
+
+    with dynamodb_stub:
+        response = handler(event, context)
+
+    dynamodb_stub.assert_no_pending_responses()
+    assert response == {  # nosec
+        "batchItemFailures": [
+            {
+                "itemIdentifier": "1",
+            },
+            {
+                "itemIdentifier": "2",
+            },
+        ],
+    }